@@ -0,0 +1,136 @@
+"""
+Пакетный планировщик анимаций всасывания и выплевывания.
+
+Все активные переходы хранятся в компактных numpy-массивах (начало,
+цель, время старта, длительность) и продвигаются одним векторизованным
+шагом. Завершенные переходы возвращаются как события, по которым
+игровая логика переключает состояния шариков.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+# Длительности анимаций в секундах
+ABSORPTION_DURATION = 1.0 / 3.0  # Всасывание
+RELEASE_DURATION = 1.0 / 4.0     # Выплевывание
+
+
+def ease_in_out(t: np.ndarray) -> np.ndarray:
+    """Функция сглаживания для плавной анимации (smoothstep)"""
+    return t * t * (3.0 - 2.0 * t)
+
+
+@dataclass
+class AnimationEvent:
+    """Событие завершения анимации"""
+    ball: Any
+    kind: Any
+
+
+class AnimationScheduler:
+    """
+    Планировщик анимаций перемещения шариков.
+
+    Анимируемый объект должен иметь position (с полями x, y) и
+    absorption_progress. Позиция интерполируется от фиксированного
+    начала к фиксированной цели, прогресс записывается в
+    absorption_progress (для reverse - от 1 к 0).
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.time = 0.0
+        self._count = 0
+        self._balls: List[Any] = []
+        self._kinds: List[Any] = []
+        self._slots: Dict[int, int] = {}  # id(ball) -> индекс в массивах
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        """Выделение (или расширение) массивов под capacity анимаций"""
+        old = self._count
+        start = np.empty((capacity, 2))
+        target = np.empty((capacity, 2))
+        start_time = np.empty(capacity)
+        duration = np.empty(capacity)
+        reverse = np.empty(capacity, dtype=bool)
+        if old:
+            start[:old] = self._start[:old]
+            target[:old] = self._target[:old]
+            start_time[:old] = self._start_time[:old]
+            duration[:old] = self._duration[:old]
+            reverse[:old] = self._reverse[:old]
+        self._start, self._target = start, target
+        self._start_time, self._duration, self._reverse = start_time, duration, reverse
+
+    def __len__(self):
+        return self._count
+
+    def start(self, ball, kind, start_pos, target_pos, duration: float,
+              reverse: bool = False):
+        """
+        Запуск анимации шарика. Если шарик уже анимируется,
+        предыдущая анимация заменяется без события завершения.
+        """
+        slot = self._slots.get(id(ball))
+        if slot is None:
+            if self._count == len(self._duration):
+                self._allocate(len(self._duration) * 2)
+            slot = self._count
+            self._count += 1
+            self._slots[id(ball)] = slot
+            self._balls.append(ball)
+            self._kinds.append(kind)
+        else:
+            self._kinds[slot] = kind
+
+        self._start[slot] = (start_pos.x, start_pos.y)
+        self._target[slot] = (target_pos.x, target_pos.y)
+        self._start_time[slot] = self.time
+        self._duration[slot] = max(duration, 1e-6)
+        self._reverse[slot] = reverse
+
+    def update(self, dt: float) -> List[AnimationEvent]:
+        """Продвижение всех анимаций на dt, возвращает завершенные"""
+        self.time += dt
+        n = self._count
+        if n == 0:
+            return []
+
+        t = np.clip((self.time - self._start_time[:n]) / self._duration[:n], 0.0, 1.0)
+        eased = ease_in_out(t)
+        start = self._start[:n]
+        positions = start + (self._target[:n] - start) * eased[:, None]
+        progress = np.where(self._reverse[:n], 1.0 - t, t)
+
+        # Запись результатов обратно в шарики без создания новых векторов
+        for ball, (x, y), p in zip(self._balls, positions.tolist(), progress.tolist()):
+            ball.position.x = x
+            ball.position.y = y
+            ball.absorption_progress = p
+
+        done = t >= 1.0
+        if not done.any():
+            return []
+
+        events = [
+            AnimationEvent(self._balls[i], self._kinds[i])
+            for i in np.flatnonzero(done).tolist()
+        ]
+        self._compact(~done)
+        return events
+
+    def _compact(self, keep: np.ndarray):
+        """Удаление завершенных анимаций со сдвигом оставшихся в начало"""
+        n = self._count
+        k = int(keep.sum())
+        for array in (self._start, self._target, self._start_time,
+                      self._duration, self._reverse):
+            array[:k] = array[:n][keep]
+        kept = keep.tolist()
+        self._balls = [ball for ball, flag in zip(self._balls, kept) if flag]
+        self._kinds = [kind for kind, flag in zip(self._kinds, kept) if flag]
+        self._slots = {id(ball): i for i, ball in enumerate(self._balls)}
+        self._count = k
@@ -0,0 +1,62 @@
+"""
+Камера: прокручиваемое и масштабируемое окно в игровой мир.
+Модуль не зависит от pygame.
+"""
+
+from typing import Tuple
+
+
+class Camera:
+    """Преобразование между координатами мира и экрана"""
+
+    def __init__(self, viewport_width: int, viewport_height: int,
+                 world_width: float, world_height: float, max_zoom: float = 4.0):
+        self.viewport_width = viewport_width
+        self.viewport_height = viewport_height
+        self.world_width = world_width
+        self.world_height = world_height
+
+        # Минимальный масштаб - весь мир помещается в окно
+        self.min_zoom = min(1.0, viewport_width / world_width, viewport_height / world_height)
+        self.max_zoom = max_zoom
+        self.zoom = 1.0
+
+        # Мировые координаты левого верхнего угла окна
+        self.x = 0.0
+        self.y = 0.0
+
+    def world_to_screen(self, x: float, y: float) -> Tuple[float, float]:
+        """Мировые координаты -> экранные"""
+        return (x - self.x) * self.zoom, (y - self.y) * self.zoom
+
+    def screen_to_world(self, x: float, y: float) -> Tuple[float, float]:
+        """Экранные координаты -> мировые"""
+        return self.x + x / self.zoom, self.y + y / self.zoom
+
+    def visible_rect(self, margin: float = 0.0) -> Tuple[float, float, float, float]:
+        """Видимая область мира (left, top, right, bottom) с запасом margin"""
+        return (
+            self.x - margin,
+            self.y - margin,
+            self.x + self.viewport_width / self.zoom + margin,
+            self.y + self.viewport_height / self.zoom + margin,
+        )
+
+    def pan(self, dx: float, dy: float):
+        """Сдвиг на (dx, dy) экранных пикселей"""
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self._clamp()
+
+    def zoom_at(self, screen_x: float, screen_y: float, factor: float):
+        """Масштабирование с сохранением точки мира под (screen_x, screen_y)"""
+        world_x, world_y = self.screen_to_world(screen_x, screen_y)
+        self.zoom = max(self.min_zoom, min(self.max_zoom, self.zoom * factor))
+        self.x = world_x - screen_x / self.zoom
+        self.y = world_y - screen_y / self.zoom
+        self._clamp()
+
+    def _clamp(self):
+        """Окно не выходит за границы мира (если мир меньше окна - прижато к началу)"""
+        self.x = max(0.0, min(self.x, self.world_width - self.viewport_width / self.zoom))
+        self.y = max(0.0, min(self.y, self.world_height - self.viewport_height / self.zoom))
@@ -0,0 +1,156 @@
+"""
+Поиск и разрешение столкновений шариков.
+
+Шарики раскладываются по ячейкам размером в диаметр самого большого
+шарика, пары-кандидаты берутся только из соседних ячеек, а точная
+проверка расстояния выполняется векторизованно. Стоимость растет
+линейно с количеством шариков, а не квадратично. Отскоки решаются
+пакетными проходами по всему списку контактов.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+# Соседние ячейки "вперед" (dx, dy): каждая пара ячеек проверяется один раз
+_FORWARD_CELLS = ((0, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+
+def find_contacts(x: np.ndarray, y: np.ndarray, radii: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Пары касающихся шариков (расстояние <= сумме радиусов).
+    Возвращает массивы индексов (first, second), first < second,
+    упорядоченные по first, затем по second.
+    """
+    count = len(x)
+    if count < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    cell_size = max(2.0 * float(radii.max()), 1e-6)
+    cx = np.floor(x / cell_size).astype(np.int64)
+    cy = np.floor(y / cell_size).astype(np.int64)
+    cx -= cx.min() - 1  # Запас в одну ячейку слева, чтобы dx=-1 не переносился на строку выше
+    cy -= cy.min()
+    width = int(cx.max()) + 2
+    key = cy * width + cx
+
+    order = np.argsort(key, kind="stable")
+    sorted_key = key[order]
+    indices = np.arange(count)
+
+    firsts, seconds = [], []
+    for dx, dy in _FORWARD_CELLS:
+        neighbor_key = key + dy * width + dx
+        start = np.searchsorted(sorted_key, neighbor_key, side="left")
+        counts = np.searchsorted(sorted_key, neighbor_key, side="right") - start
+        total = int(counts.sum())
+        if total == 0:
+            continue
+
+        # Развертка диапазонов [start, start + counts) в плоский список пар
+        first = np.repeat(indices, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        second = order[np.repeat(start, counts) + offsets]
+
+        if dx == 0 and dy == 0:
+            keep = first < second
+            first, second = first[keep], second[keep]
+        firsts.append(first)
+        seconds.append(second)
+
+    if not firsts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+
+    first = np.concatenate(firsts)
+    second = np.concatenate(seconds)
+    first, second = np.minimum(first, second), np.maximum(first, second)
+
+    # Точная проверка расстояния
+    reach = radii[first] + radii[second]
+    touching = (x[first] - x[second]) ** 2 + (y[first] - y[second]) ** 2 <= reach * reach
+    first, second = first[touching], second[touching]
+
+    order = np.lexsort((second, first))
+    return first[order], second[order]
+
+
+def _contact_normals(x: np.ndarray, y: np.ndarray, first: np.ndarray,
+                     second: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Единичные нормали от first к second и расстояния между центрами"""
+    dx = x[second] - x[first]
+    dy = y[second] - y[first]
+    distance = np.sqrt(dx * dx + dy * dy)
+    safe = np.where(distance > 1e-9, distance, 1.0)
+    # Совпадающие центры расталкиваем по оси x
+    nx = np.where(distance > 1e-9, dx / safe, 1.0)
+    ny = np.where(distance > 1e-9, dy / safe, 0.0)
+    return nx, ny, distance
+
+
+def approach_speeds(x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+                    first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Скорость сближения пар вдоль нормали (положительная - сближаются)"""
+    nx, ny, _ = _contact_normals(x, y, first, second)
+    return -((vx[second] - vx[first]) * nx + (vy[second] - vy[first]) * ny)
+
+
+def _apply(values: np.ndarray, first: np.ndarray, second: np.ndarray,
+           amount: np.ndarray, inv_mass: np.ndarray):
+    """Равные и противоположные изменения по контактам (first - против, second - вдоль)"""
+    np.add.at(values, first, -amount * inv_mass[first])
+    np.add.at(values, second, amount * inv_mass[second])
+
+
+def solve_contacts(x: np.ndarray, y: np.ndarray, vx: np.ndarray, vy: np.ndarray,
+                   inv_mass: np.ndarray, radii: np.ndarray,
+                   first: np.ndarray, second: np.ndarray,
+                   restitution: float = 0.8, iterations: int = 4,
+                   correction: float = 0.8):
+    """
+    Отскоки шариков по списку контактов (массивы изменяются на месте).
+
+    Импульсы считаются пакетно по всем контактам сразу (Якоби): на каждом
+    проходе вычисляются поправки всех контактов и одновременно
+    применяются. Чтобы не было перелета, поправка контакта умножается
+    на 1/k, где k - наибольшее число контактов у его шариков; оба
+    шарика контакта получают один и тот же импульс с разными знаками,
+    поэтому суммарный импульс сохраняется. Накопленный импульс контакта
+    не бывает отрицательным, целевая скорость расхождения - restitution
+    от скорости сближения (1.0 - упругий удар, меньше - неупругий).
+    После этого перекрытия убираются итеративной коррекцией позиций
+    (центр масс не смещается).
+    """
+    if len(first) == 0:
+        return
+
+    contacts_per_ball = np.bincount(np.concatenate((first, second)), minlength=len(x))
+    relaxation = 1.0 / np.maximum(contacts_per_ball[first], contacts_per_ball[second])
+    inv_sum = inv_mass[first] + inv_mass[second]
+
+    # Скоростные проходы
+    nx, ny, _ = _contact_normals(x, y, first, second)
+    relative = (vx[second] - vx[first]) * nx + (vy[second] - vy[first]) * ny
+    target = np.where(relative < 0, -restitution * relative, 0.0)
+    accumulated = np.zeros(len(first))
+    for _ in range(iterations):
+        relative = (vx[second] - vx[first]) * nx + (vy[second] - vy[first]) * ny
+        impulse = relaxation * (target - relative) / inv_sum
+        new_accumulated = np.maximum(accumulated + impulse, 0.0)
+        impulse = new_accumulated - accumulated  # Фактически примененная часть
+        accumulated = new_accumulated
+        _apply(vx, first, second, impulse * nx, inv_mass)
+        _apply(vy, first, second, impulse * ny, inv_mass)
+
+    # Позиционные проходы
+    for _ in range(iterations):
+        nx, ny, distance = _contact_normals(x, y, first, second)
+        penetration = radii[first] + radii[second] - distance
+        if not (penetration > 0).any():
+            break
+        shift = relaxation * correction * np.maximum(penetration, 0.0) / inv_sum
+        _apply(x, first, second, shift * nx, inv_mass)
+        _apply(y, first, second, shift * ny, inv_mass)
+
@@ -1,26 +1,44 @@
+import argparse
 import pygame
 import sys
 import math
-from logic import GameLogic, BallState, Vector2
+import time
+from camera import Camera
+from logic import GameLogic, BallState, CollisionMode, Vector2
+from metrics import (
+    Histogram, FRAME_BUCKETS, MetricsRegistry,
+    register_game_metrics, register_frame_metrics, start_exporters_from_env,
+)
+from quality import QualityController, QUALITY_LEVELS
+from settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, BACKGROUND_COLOR,
+    UI_COLOR, BORDER_COLOR, TEXT_COLOR, DELETION_ZONE_COLOR,
+    ABSORPTION_CIRCLE_COLOR, DELETION_TEXT_COLOR, INITIAL_BALLS_COUNT,
+    WORLD_WIDTH, WORLD_HEIGHT, CAMERA_PAN_SPEED, CAMERA_ZOOM_STEP,
+    OFFSCREEN_TICK_INTERVAL, ACTIVE_MARGIN,
+    COLLISION_MODE, RESTITUTION, MERGE_SPEED_THRESHOLD,
+)
 
-# Инициализация Pygame
-pygame.init()
+# pygame.init() не вызывается при импорте: BallGame поднимает только
+# видеоподсистему, а шрифты загружаются при первой отрисовке текста
 
-# Константы
-SCREEN_WIDTH = 1000
-SCREEN_HEIGHT = 700
-FPS = 60
-BACKGROUND_COLOR = (255, 255, 255)  # Белый фон
+# Размеры шрифтов
+FONT_SIZE = 24
+SMALL_FONT_SIZE = 18
 
-# Цвета интерфейса
-UI_COLOR = (240, 240, 240)
-BORDER_COLOR = (200, 200, 200)
-TEXT_COLOR = (50, 50, 50)
-DELETION_ZONE_COLOR = (255, 100, 100, 100)  # Полупрозрачный красный
-ABSORPTION_CIRCLE_COLOR = (100, 150, 255, 80)  # Полупрозрачный синий
+# Инструкции в информационной панели
+INSTRUCTIONS = [
+    "ЛКМ - всосать",
+    "ПКМ - выплюнуть",
+    "SPACE - новый шарик",
+    "Стрелки/колесо - камера"
+]
 
-# Настройки игры
-INITIAL_BALLS_COUNT = 8  # Стартовое количество шариков
+# Неизменные строки интерфейса, отрисовываемые один раз: (текст, размер, цвет)
+FIXED_UI_TEXTS = [
+    ("Инвентарь", FONT_SIZE, TEXT_COLOR),
+    ("УДАЛЕНИЕ", SMALL_FONT_SIZE, DELETION_TEXT_COLOR),
+] + [(instruction, SMALL_FONT_SIZE, TEXT_COLOR) for instruction in INSTRUCTIONS]
 
 
 class GameRenderer:
@@ -28,45 +46,127 @@ class GameRenderer:
     
     def __init__(self, screen):
         self.screen = screen
-        self.font = pygame.font.Font(None, 24)
-        self.small_font = pygame.font.Font(None, 18)
+        self._fonts = {}  # Размер -> шрифт, загружаются по требованию
+        self._text_cache = {}  # (текст, размер, цвет) -> готовая поверхность
+        
+        # Адаптивное качество: текущий уровень и кэш панелей интерфейса
+        self.quality = QUALITY_LEVELS[0]
+        self.frame_index = 0
+        self._panel_cache = {}  # Название панели -> копия отрисованной панели
+        
+        # Камера (мировые координаты -> экранные); без камеры мир совпадает с экраном
+        self.camera = None
         
         # Создаем поверхности для полупрозрачных элементов
         self.transparent_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
     
+    @property
+    def font(self):
+        return self._get_font(FONT_SIZE)
+    
+    @property
+    def small_font(self):
+        return self._get_font(SMALL_FONT_SIZE)
+    
+    def _get_font(self, size):
+        """Ленивая загрузка шрифта (с инициализацией модуля шрифтов)"""
+        font = self._fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+        return font
+    
+    def _build_text_cache(self):
+        """Однократная отрисовка всех неизменных строк интерфейса"""
+        for text, size, color in FIXED_UI_TEXTS:
+            self._text_cache[(text, size, color)] = self._get_font(size).render(text, True, color)
+    
+    def render_text(self, text, size=FONT_SIZE, color=TEXT_COLOR):
+        """Поверхность с текстом: неизменные строки берутся из кэша"""
+        if not self._text_cache:
+            self._build_text_cache()
+        surface = self._text_cache.get((text, size, color))
+        if surface is None:
+            surface = self._get_font(size).render(text, True, color)
+        return surface
+    
+    def begin_frame(self, quality):
+        """Начало нового кадра с заданным уровнем качества"""
+        self.quality = quality
+        self.frame_index += 1
+    
+    def _to_screen(self, x, y):
+        """Мировые координаты -> экранные"""
+        if self.camera is None:
+            return x, y
+        return self.camera.world_to_screen(x, y)
+    
+    def _scale(self, length):
+        """Мировая длина -> экранная"""
+        return length if self.camera is None else length * self.camera.zoom
+    
+    def draw_balls(self, balls):
+        """Отрисовка шариков, попадающих в окно (остальные отсекаются)"""
+        if self.camera is None:
+            left, top, right, bottom = 0, 0, SCREEN_WIDTH, SCREEN_HEIGHT
+        else:
+            left, top, right, bottom = self.camera.visible_rect()
+        
+        for ball in balls:
+            if ball.state == BallState.IN_INVENTORY:
+                continue
+            x, y, radius = ball.position.x, ball.position.y, ball.radius
+            if x + radius < left or x - radius > right or y + radius < top or y - radius > bottom:
+                continue
+            self.draw_ball(ball)
+    
     def draw_ball(self, ball):
         """Отрисовка одного шарика"""
-        x, y = int(ball.position.x), int(ball.position.y)
-        radius = int(ball.radius)
+        x, y = self._to_screen(ball.position.x, ball.position.y)
+        x, y = int(x), int(y)
+        radius = int(self._scale(ball.radius))
         color = ball.color.to_tuple()
+        quality = self.quality
+        
+        # Дешевая отрисовка совсем маленьких шариков
+        if radius < quality.lod_radius:
+            size = max(1, radius * 2)
+            self.screen.fill(color, (x - radius, y - radius, size, size))
+            return
         
         # Основной шарик
         pygame.draw.circle(self.screen, color, (x, y), radius)
         
         # Блик для объема
-        highlight_color = tuple(min(255, c + 60) for c in color)
-        highlight_offset = radius // 3
-        pygame.draw.circle(
-            self.screen, 
-            highlight_color, 
-            (x - highlight_offset, y - highlight_offset), 
-            radius // 3
-        )
+        if quality.draw_highlights:
+            highlight_color = tuple(min(255, c + 60) for c in color)
+            highlight_offset = radius // 3
+            pygame.draw.circle(
+                self.screen, 
+                highlight_color, 
+                (x - highlight_offset, y - highlight_offset), 
+                radius // 3
+            )
         
         # Тонкая обводка
-        outline_color = tuple(max(0, c - 40) for c in color)
-        pygame.draw.circle(self.screen, outline_color, (x, y), radius, 2)
+        if quality.draw_outlines:
+            outline_color = tuple(max(0, c - 40) for c in color)
+            pygame.draw.circle(self.screen, outline_color, (x, y), radius, 2)
         
         # Анимация всасывания/выплевывания
+        if not quality.draw_effects:
+            return
         if ball.state == BallState.BEING_ABSORBED:
-            self._draw_absorption_effect(ball)
+            self._draw_absorption_effect(ball, x, y, radius)
         elif ball.state == BallState.BEING_RELEASED:
-            self._draw_release_effect(ball)
+            self._draw_release_effect(ball, x, y, radius)
     
-    def _draw_absorption_effect(self, ball):
+    def _draw_absorption_effect(self, ball, x, y, radius):
         """Эффект всасывания"""
         progress = ball.absorption_progress
-        effect_radius = int(ball.radius * (1.5 - progress * 0.5))
+        effect_radius = int(radius * (1.5 - progress * 0.5))
         effect_alpha = int(100 * (1 - progress))
         
         if effect_alpha > 0:
@@ -75,13 +175,12 @@ class GameRenderer:
             effect_color = (*ball.color.to_tuple(), effect_alpha)
             pygame.draw.circle(effect_surface, effect_color, (effect_radius, effect_radius), effect_radius, 3)
             
-            x, y = int(ball.position.x), int(ball.position.y)
             self.screen.blit(effect_surface, (x - effect_radius, y - effect_radius))
     
-    def _draw_release_effect(self, ball):
+    def _draw_release_effect(self, ball, x, y, radius):
         """Эффект выплевывания"""
         progress = 1.0 - ball.absorption_progress
-        effect_radius = int(ball.radius * (1 + progress * 0.8))
+        effect_radius = int(radius * (1 + progress * 0.8))
         effect_alpha = int(80 * progress)
         
         if effect_alpha > 0:
@@ -89,23 +188,41 @@ class GameRenderer:
             effect_color = (*ball.color.to_tuple(), effect_alpha)
             pygame.draw.circle(effect_surface, effect_color, (effect_radius, effect_radius), effect_radius, 2)
             
-            x, y = int(ball.position.x), int(ball.position.y)
             self.screen.blit(effect_surface, (x - effect_radius, y - effect_radius))
     
+    def _draw_cached_panel(self, name, rect, draw_func):
+        """
+        Отрисовка панели интерфейса с пониженной частотой обновления:
+        между обновлениями выводится копия последней отрисовки
+        """
+        cached = self._panel_cache.get(name)
+        if cached is None or self.frame_index % self.quality.ui_refresh_interval == 0:
+            draw_func()
+            self._panel_cache[name] = self.screen.subsurface(rect).copy()
+        else:
+            self.screen.blit(cached, rect.topleft)
+    
     def draw_inventory(self, inventory):
         """Отрисовка инвентаря"""
+        inventory_rect = pygame.Rect(10, 10, 260, 130)  # Вмещает оба ряда слотов
+        self._draw_cached_panel(
+            "inventory", inventory_rect,
+            lambda: self._draw_inventory_panel(inventory, inventory_rect)
+        )
+    
+    def _draw_inventory_panel(self, inventory, inventory_rect):
+        """Отрисовка содержимого панели инвентаря"""
         # Фон инвентаря
-        inventory_rect = pygame.Rect(10, 10, 260, 120)
         pygame.draw.rect(self.screen, UI_COLOR, inventory_rect)
         pygame.draw.rect(self.screen, BORDER_COLOR, inventory_rect, 2)
         
         # Заголовок
-        title_text = self.font.render("Инвентарь", True, TEXT_COLOR)
+        title_text = self.render_text("Инвентарь")
         self.screen.blit(title_text, (20, 20))
         
         # Счетчик шариков
         count_text = f"{len(inventory.balls)}/{inventory.max_size}"
-        count_surface = self.small_font.render(count_text, True, TEXT_COLOR)
+        count_surface = self.render_text(count_text, SMALL_FONT_SIZE)
         self.screen.blit(count_surface, (220, 22))
         
         # Слоты инвентаря
@@ -137,9 +254,10 @@ class GameRenderer:
         """Отрисовка зоны удаления"""
         # Полупрозрачный красный прямоугольник
         self.transparent_surface.fill((0, 0, 0, 0))  # Очищаем
+        zone_x, zone_y = self._to_screen(deletion_zone.x, deletion_zone.y)
         zone_rect = pygame.Rect(
-            deletion_zone.x, deletion_zone.y, 
-            deletion_zone.width, deletion_zone.height
+            zone_x, zone_y, 
+            self._scale(deletion_zone.width), self._scale(deletion_zone.height)
         )
         pygame.draw.rect(self.transparent_surface, DELETION_ZONE_COLOR, zone_rect)
         self.screen.blit(self.transparent_surface, (0, 0))
@@ -148,58 +266,86 @@ class GameRenderer:
         pygame.draw.rect(self.screen, (255, 0, 0), zone_rect, 2)
         
         # Текст
-        text = self.small_font.render("УДАЛЕНИЕ", True, (255, 0, 0))
+        text = self.render_text("УДАЛЕНИЕ", SMALL_FONT_SIZE, DELETION_TEXT_COLOR)
         text_rect = text.get_rect(center=(zone_rect.centerx, zone_rect.centery))
         self.screen.blit(text, text_rect)
     
     def draw_absorption_radius(self, mouse_pos, radius):
         """Отрисовка радиуса всасывания вокруг мыши"""
         self.transparent_surface.fill((0, 0, 0, 0))
-        pygame.draw.circle(self.transparent_surface, ABSORPTION_CIRCLE_COLOR, mouse_pos, radius, 3)
+        pygame.draw.circle(self.transparent_surface, ABSORPTION_CIRCLE_COLOR, mouse_pos, self._scale(radius), 3)
         self.screen.blit(self.transparent_surface, (0, 0))
     
     def draw_ui_info(self, game_logic):
         """Отрисовка дополнительной информации"""
+        info_rect = pygame.Rect(SCREEN_WIDTH - 200, 10, 180, 50 + len(INSTRUCTIONS) * 15)
+        self._draw_cached_panel(
+            "info", info_rect,
+            lambda: self._draw_info_panel(game_logic, info_rect)
+        )
+    
+    def _draw_info_panel(self, game_logic, info_rect):
+        """Отрисовка содержимого информационной панели"""
         # Информационная панель
-        info_rect = pygame.Rect(SCREEN_WIDTH - 200, 10, 180, 80)
         pygame.draw.rect(self.screen, UI_COLOR, info_rect)
         pygame.draw.rect(self.screen, BORDER_COLOR, info_rect, 2)
         
         # Количество шариков на экране
-        balls_count = len([ball for ball in game_logic.balls if ball.state == BallState.FREE])
+        balls_count = sum(1 for ball in game_logic.balls if ball.state == BallState.FREE)
         balls_text = f"Шариков: {balls_count}"
-        balls_surface = self.small_font.render(balls_text, True, TEXT_COLOR)
+        balls_surface = self.render_text(balls_text, SMALL_FONT_SIZE)
         self.screen.blit(balls_surface, (SCREEN_WIDTH - 190, 20))
         
         # Инструкции
-        instructions = [
-            "ЛКМ - всосать",
-            "ПКМ - выплюнуть", 
-            "SPACE - новый шарик"
-        ]
-        for i, instruction in enumerate(instructions):
-            inst_surface = self.small_font.render(instruction, True, TEXT_COLOR)
+        for i, instruction in enumerate(INSTRUCTIONS):
+            inst_surface = self.render_text(instruction, SMALL_FONT_SIZE)
             self.screen.blit(inst_surface, (SCREEN_WIDTH - 190, 40 + i * 15))
+        
+        # Текущий уровень качества отрисовки
+        quality_text = f"Качество: {self.quality.name}"
+        quality_surface = self.render_text(quality_text, SMALL_FONT_SIZE)
+        self.screen.blit(quality_surface, (SCREEN_WIDTH - 190, 40 + len(INSTRUCTIONS) * 15))
 
 
 class BallGame:
     """Основной класс игры"""
     
-    def __init__(self):
+    def __init__(self, world_width: int = WORLD_WIDTH, world_height: int = WORLD_HEIGHT,
+                 initial_balls: int = INITIAL_BALLS_COUNT,
+                 offscreen_tick_interval: int = OFFSCREEN_TICK_INTERVAL,
+                 collision_mode: str = COLLISION_MODE, restitution: float = RESTITUTION,
+                 merge_speed_threshold: float = MERGE_SPEED_THRESHOLD):
+        # Инициализируем только видеоподсистему (без аудио, джойстиков и т.д.)
+        pygame.display.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Игра про шарики")
         self.clock = pygame.time.Clock()
         
-        # Игровая логика
-        self.game_logic = GameLogic(SCREEN_WIDTH, SCREEN_HEIGHT)
+        # Игровая логика (размер мира не зависит от окна)
+        self.game_logic = GameLogic(world_width, world_height)
+        self.game_logic.offscreen_tick_interval = offscreen_tick_interval
+        self.game_logic.collision_mode = CollisionMode(collision_mode)
+        self.game_logic.restitution = restitution
+        self.game_logic.merge_speed_threshold = merge_speed_threshold
         
         # Генерируем дополнительные шарики до нужного количества
         current_balls = len(self.game_logic.balls)
-        for _ in range(max(0, INITIAL_BALLS_COUNT - current_balls)):
-            self.game_logic.add_random_ball()
+        self.game_logic.spawn_balls(max(0, initial_balls - current_balls))
+        
+        # Камера
+        self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, world_width, world_height)
         
-        # Рендерер
+        # Рендерер и адаптивное качество отрисовки
         self.renderer = GameRenderer(self.screen)
+        self.renderer.camera = self.camera
+        self.quality_controller = QualityController()
+        
+        # Метрики кадров
+        self.frame_count = 0
+        self.frame_histogram = Histogram(FRAME_BUCKETS)  # Время работы кадра, секунды
+        self.metrics = MetricsRegistry()
+        register_game_metrics(self.metrics, self.game_logic)
+        register_frame_metrics(self.metrics, self)
         
         # Состояние мыши
         self.mouse_pressed = {"left": False, "right": False}
@@ -226,6 +372,11 @@ class BallGame:
                 elif event.button == 3:
                     self.mouse_pressed["right"] = False
             
+            elif event.type == pygame.MOUSEWHEEL:
+                # Масштабирование относительно курсора
+                mouse_x, mouse_y = pygame.mouse.get_pos()
+                self.camera.zoom_at(mouse_x, mouse_y, CAMERA_ZOOM_STEP ** event.y)
+            
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     # Добавить новый случайный шарик
@@ -235,11 +386,31 @@ class BallGame:
         
         return True
     
+    def _update_camera(self, dt):
+        """Прокрутка камеры стрелками или WASD"""
+        keys = pygame.key.get_pressed()
+        dx = (keys[pygame.K_RIGHT] or keys[pygame.K_d]) - (keys[pygame.K_LEFT] or keys[pygame.K_a])
+        dy = (keys[pygame.K_DOWN] or keys[pygame.K_s]) - (keys[pygame.K_UP] or keys[pygame.K_w])
+        if dx or dy:
+            self.camera.pan(dx * CAMERA_PAN_SPEED * dt, dy * CAMERA_PAN_SPEED * dt)
+    
     def update(self, dt):
         """Обновление игровой логики"""
-        # Обновляем позицию мыши
+        self._update_camera(dt)
+        
+        # Обновляем позицию мыши (в координатах мира)
         mouse_x, mouse_y = pygame.mouse.get_pos()
-        self.game_logic.set_mouse_position(mouse_x, mouse_y)
+        self.game_logic.set_mouse_position(*self.camera.screen_to_world(mouse_x, mouse_y))
+        
+        # Шарики летят в инвентарь - к его месту на экране
+        inventory_x, inventory_y = self.camera.screen_to_world(50, 50)
+        self.game_logic.inventory.position = Vector2(inventory_x, inventory_y)
+        
+        # Полная симуляция - в окне и рядом с ним. Запас не меньше самого
+        # большого радиуса: шарик, задевающий окно краем, тоже отрисовывается
+        self.game_logic.active_rect = self.camera.visible_rect(
+            ACTIVE_MARGIN + self.game_logic.max_ball_radius
+        )
         
         # Обновляем кулдауны
         self.absorption_cooldown = max(0, self.absorption_cooldown - dt)
@@ -260,6 +431,8 @@ class BallGame:
     
     def render(self):
         """Отрисовка игры"""
+        self.renderer.begin_frame(self.quality_controller.level)
+        
         # Очищаем экран
         self.screen.fill(BACKGROUND_COLOR)
         
@@ -271,10 +444,8 @@ class BallGame:
             mouse_pos = pygame.mouse.get_pos()
             self.renderer.draw_absorption_radius(mouse_pos, self.game_logic.absorption_radius)
         
-        # Отрисовываем все шарики
-        for ball in self.game_logic.balls:
-            if ball.state in [BallState.FREE, BallState.BEING_ABSORBED, BallState.BEING_RELEASED]:
-                self.renderer.draw_ball(ball)
+        # Отрисовываем шарики в окне камеры (кандидаты - шарики активной области)
+        self.renderer.draw_balls(self.game_logic.active_balls)
         
         # Отрисовываем интерфейс
         self.renderer.draw_inventory(self.game_logic.inventory)
@@ -293,11 +464,19 @@ class BallGame:
             # Обрабатываем события
             running = self.handle_events()
             
+            frame_start = time.perf_counter()
+            
             # Обновляем логику
             self.update(dt)
             
             # Отрисовываем
             self.render()
+            
+            # Время работы кадра (без ожидания clock.tick) для адаптивного качества и метрик
+            frame_seconds = time.perf_counter() - frame_start
+            self.quality_controller.record_frame(frame_seconds * 1000.0)
+            self.frame_histogram.observe(frame_seconds)
+            self.frame_count += 1
         
         pygame.quit()
         sys.exit()
@@ -305,19 +484,35 @@ class BallGame:
 
 def main():
     """Точка входа в программу"""
+    parser = argparse.ArgumentParser(description="Игра про шарики")
+    parser.add_argument("--world-width", type=int, default=WORLD_WIDTH, help="ширина мира")
+    parser.add_argument("--world-height", type=int, default=WORLD_HEIGHT, help="высота мира")
+    parser.add_argument("--balls", type=int, default=INITIAL_BALLS_COUNT, help="стартовое количество шариков")
+    parser.add_argument("--offscreen-interval", type=int, default=OFFSCREEN_TICK_INTERVAL,
+                        help="шарики вне экрана обновляются раз в N тиков (1 - всегда)")
+    parser.add_argument("--collision-mode", choices=[mode.value for mode in CollisionMode],
+                        default=COLLISION_MODE, help="реакция на столкновение: слияние или отскок")
+    parser.add_argument("--restitution", type=float, default=RESTITUTION, help="упругость отскока")
+    parser.add_argument("--merge-speed", type=float, default=MERGE_SPEED_THRESHOLD,
+                        help="в режиме отскока сливать пары, сближающиеся быстрее (пикс/с)")
+    args = parser.parse_args()
+    
     print("🎮 Запуск игры про шарики...")
-    print(f"📊 Стартовое количество шариков: {INITIAL_BALLS_COUNT}")
+    print(f"📊 Стартовое количество шариков: {args.balls}")
     print("🎯 Управление:")
     print("   • ЛКМ - всасывать шарики")
     print("   • ПКМ - выплевывать шарики")
     print("   • SPACE - добавить новый шарик")
+    print("   • Стрелки/WASD, колесо мыши - прокрутка и масштаб камеры")
     print("   • ESC - выход")
     print("🎨 Шарики смешивают цвета при столкновении")
     print("🗑️ Красная зона - удаление шариков")
     print()
     
     try:
-        game = BallGame()
+        game = BallGame(args.world_width, args.world_height, args.balls, args.offscreen_interval,
+                        args.collision_mode, args.restitution, args.merge_speed)
+        start_exporters_from_env(game.metrics)
         game.run()
     except Exception as e:
         print(f"❌ Ошибка запуска игры: {e}")
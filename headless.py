@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Безголовый запуск симуляции шариков.
+Не импортирует pygame - подходит для воркеров и серверных инструментов.
+"""
+
+import argparse
+import time
+
+from logic import CollisionMode, GameLogic
+from metrics import MetricsRegistry, register_game_metrics, start_exporters_from_env
+from settings import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, FPS, INITIAL_BALLS_COUNT,
+    COLLISION_MODE, RESTITUTION, MERGE_SPEED_THRESHOLD,
+)
+
+
+def run_simulation(ticks: int, seed: int = None, balls: int = INITIAL_BALLS_COUNT,
+                   width: int = SCREEN_WIDTH, height: int = SCREEN_HEIGHT,
+                   game: GameLogic = None) -> GameLogic:
+    """Симуляция заданного количества тиков с фиксированным шагом"""
+    if game is None:
+        game = GameLogic(width, height, seed=seed)
+    game.spawn_balls(max(0, balls - len(game.balls)))
+
+    dt = 1.0 / FPS
+    for _ in range(ticks):
+        game.update(dt)
+    return game
+
+
+def main():
+    """Точка входа безголовой симуляции"""
+    parser = argparse.ArgumentParser(description="Безголовая симуляция шариков")
+    parser.add_argument("--ticks", type=int, default=FPS * 10, help="количество тиков")
+    parser.add_argument("--seed", type=int, default=None, help="seed генератора мира")
+    parser.add_argument("--balls", type=int, default=INITIAL_BALLS_COUNT, help="стартовое количество шариков")
+    parser.add_argument("--width", type=int, default=SCREEN_WIDTH, help="ширина мира")
+    parser.add_argument("--height", type=int, default=SCREEN_HEIGHT, help="высота мира")
+    parser.add_argument("--collision-mode", choices=[mode.value for mode in CollisionMode],
+                        default=COLLISION_MODE, help="реакция на столкновение: слияние или отскок")
+    parser.add_argument("--restitution", type=float, default=RESTITUTION, help="упругость отскока")
+    parser.add_argument("--merge-speed", type=float, default=MERGE_SPEED_THRESHOLD,
+                        help="в режиме отскока сливать пары, сближающиеся быстрее (пикс/с)")
+    args = parser.parse_args()
+
+    # Экспорт метрик включается переменными окружения BALLGAME_METRICS_*
+    game = GameLogic(args.width, args.height, seed=args.seed)
+    game.collision_mode = CollisionMode(args.collision_mode)
+    game.restitution = args.restitution
+    game.merge_speed_threshold = args.merge_speed
+    registry = MetricsRegistry()
+    register_game_metrics(registry, game)
+    start_exporters_from_env(registry)
+
+    start = time.perf_counter()
+    run_simulation(args.ticks, balls=args.balls, game=game)
+    elapsed = time.perf_counter() - start
+
+    print(f"Тиков: {args.ticks}, время: {elapsed:.3f} с")
+    print(f"Шариков на экране: {len(game.balls)}, в инвентаре: {len(game.inventory.balls)}")
+    print(f"Слияний: {game.merge_count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Синтетическая нагрузка на игровую логику.
+
+Мир управляется N скриптовыми ботами, у каждого свой курсор и инвентарь.
+Запуск безголовый и детерминированный по seed (кроме замеров времени).
+Отчет: распределение задержки тика, население шариков и темп слияний.
+"""
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from logic import GameLogic, Inventory, Vector2
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, INITIAL_BALLS_COUNT
+
+
+class Bot:
+    """Базовый бот: собственный курсор, инвентарь и генератор случайных чисел"""
+
+    def __init__(self, bot_id: int, game: GameLogic, rng: np.random.Generator,
+                 cursor_speed: float = 600):
+        self.bot_id = bot_id
+        self.rng = rng
+        self.inventory = Inventory()
+        self.cursor = Vector2(*rng.uniform((0, 0), (game.screen_width, game.screen_height)).tolist())
+        self.cursor_speed = cursor_speed  # Пикселей в секунду
+        self._target = Vector2(self.cursor.x, self.cursor.y)
+
+    def act(self, game: GameLogic, tick: int, dt: float):
+        """Действия бота за один тик"""
+        self._move_cursor(game, dt)
+
+    def _move_cursor(self, game: GameLogic, dt: float):
+        """Движение курсора к цели; по достижении цель - случайный шарик"""
+        delta = self._target - self.cursor
+        distance = delta.magnitude()
+        step = self.cursor_speed * dt
+        if distance <= step:
+            self.cursor = Vector2(self._target.x, self._target.y)
+            self._pick_target(game)
+        else:
+            self.cursor = self.cursor + delta * (step / distance)
+
+    def _pick_target(self, game: GameLogic):
+        """Выбор новой цели курсора"""
+        if game.balls:
+            ball = game.balls[int(self.rng.integers(len(game.balls)))]
+            self._target = Vector2(ball.position.x, ball.position.y)
+        else:
+            self._target = Vector2(*self.rng.uniform(
+                (0, 0), (game.screen_width, game.screen_height)).tolist())
+
+    def _release_random(self, game: GameLogic, speed: float) -> bool:
+        """Выплевывание шарика в случайном направлении"""
+        angle = self.rng.uniform(0, 2 * np.pi)
+        direction = Vector2(float(np.cos(angle)) * speed, float(np.sin(angle)) * speed)
+        return game.release_ball(direction, self.cursor, self.inventory)
+
+
+class AbsorbSpamBot(Bot):
+    """Всасывает на каждом тике; при полном инвентаре выплевывает по одному"""
+
+    def act(self, game: GameLogic, tick: int, dt: float):
+        super().act(game, tick, dt)
+        if not self.inventory.can_add_ball():
+            self._release_random(game, 100)
+        game.try_absorb_ball(self.cursor, self.inventory)
+
+
+class ReleaseStormBot(Bot):
+    """Набирает полный инвентарь и выплевывает все шарики за один тик"""
+
+    def __init__(self, bot_id: int, game: GameLogic, rng: np.random.Generator,
+                 storm_speed: float = 300, max_collect_ticks: int = FPS * 5):
+        super().__init__(bot_id, game, rng)
+        self.storm_speed = storm_speed
+        self.max_collect_ticks = max_collect_ticks  # Не дольше стольких тиков сбора
+        self._collect_ticks = 0
+
+    def act(self, game: GameLogic, tick: int, dt: float):
+        super().act(game, tick, dt)
+        self._collect_ticks += 1
+        if self.inventory.can_add_ball() and self._collect_ticks < self.max_collect_ticks:
+            game.try_absorb_ball(self.cursor, self.inventory)
+            return
+
+        while self._release_random(game, self.storm_speed):
+            pass
+        self._collect_ticks = 0
+
+
+class SpawnBurstBot(Bot):
+    """Периодически создает пачку новых шариков"""
+
+    def __init__(self, bot_id: int, game: GameLogic, rng: np.random.Generator,
+                 burst_size: int = 20, interval: int = FPS):
+        super().__init__(bot_id, game, rng)
+        self.burst_size = burst_size
+        self.interval = interval  # Тиков между пачками
+
+    def act(self, game: GameLogic, tick: int, dt: float):
+        super().act(game, tick, dt)
+        if tick % self.interval == self.bot_id % self.interval:
+            game.spawn_balls(self.burst_size, method="poisson")
+
+
+# Доступные поведения ботов
+BOT_BEHAVIORS = {
+    "absorb_spam": AbsorbSpamBot,
+    "release_storm": ReleaseStormBot,
+    "spawn_burst": SpawnBurstBot,
+}
+
+
+@dataclass
+class LoadReport:
+    """Результаты нагрузочного прогона"""
+    ticks: int
+    bots: int
+    tick_ms: np.ndarray                  # Задержка каждого тика, мс
+    samples: List[Tuple[float, int, float]] = field(default_factory=list)  # (время, шариков, слияний/с)
+    total_merges: int = 0
+
+    def latency_percentiles(self) -> dict:
+        """Перцентили задержки тика, мс"""
+        p50, p90, p99 = np.percentile(self.tick_ms, [50, 90, 99])
+        return {"p50": p50, "p90": p90, "p99": p99, "max": float(self.tick_ms.max())}
+
+
+def create_bots(game: GameLogic, count: int, behaviors: List[str], seed: int = None) -> List[Bot]:
+    """Создание ботов с поведениями по кругу и независимыми генераторами"""
+    seeds = np.random.SeedSequence(seed).spawn(count)
+    return [
+        BOT_BEHAVIORS[behaviors[i % len(behaviors)]](i, game, np.random.default_rng(seeds[i]))
+        for i in range(count)
+    ]
+
+
+def run_load_test(bots: int, behaviors: List[str], ticks: int, seed: int = None,
+                  balls: int = INITIAL_BALLS_COUNT, width: int = SCREEN_WIDTH,
+                  height: int = SCREEN_HEIGHT, sample_interval: int = FPS) -> LoadReport:
+    """Прогон мира с ботами на фиксированное количество тиков"""
+    game = GameLogic(width, height, seed=seed)
+    game.spawn_balls(max(0, balls - len(game.balls)))
+    players = create_bots(game, bots, behaviors, seed)
+
+    dt = 1.0 / FPS
+    report = LoadReport(ticks=ticks, bots=bots, tick_ms=np.empty(ticks))
+    merges_at_sample = 0
+
+    for tick in range(ticks):
+        start = time.perf_counter()
+        for bot in players:
+            bot.act(game, tick, dt)
+        game.update(dt)
+        report.tick_ms[tick] = (time.perf_counter() - start) * 1000.0
+
+        if (tick + 1) % sample_interval == 0:
+            merges = game.merge_count - merges_at_sample
+            merges_at_sample = game.merge_count
+            report.samples.append(((tick + 1) * dt, len(game.balls), merges / (sample_interval * dt)))
+
+    report.total_merges = game.merge_count
+    return report
+
+
+def print_report(report: LoadReport):
+    """Вывод отчета нагрузочного прогона"""
+    print(f"Ботов: {report.bots}, тиков: {report.ticks}, слияний всего: {report.total_merges}")
+    latency = report.latency_percentiles()
+    print("Задержка тика, мс: " + ", ".join(f"{name}={value:.2f}" for name, value in latency.items()))
+    print(f"{'Время, с':>10} {'Шариков':>10} {'Слияний/с':>10}")
+    for elapsed, population, merge_rate in report.samples:
+        print(f"{elapsed:>10.1f} {population:>10} {merge_rate:>10.2f}")
+
+
+def main():
+    """Точка входа генератора нагрузки"""
+    parser = argparse.ArgumentParser(description="Синтетическая нагрузка ботами на GameLogic")
+    parser.add_argument("--bots", type=int, default=8, help="количество ботов")
+    parser.add_argument("--behaviors", default=",".join(BOT_BEHAVIORS),
+                        help="поведения ботов через запятую (назначаются по кругу): "
+                             + ", ".join(BOT_BEHAVIORS))
+    parser.add_argument("--ticks", type=int, default=FPS * 30, help="количество тиков")
+    parser.add_argument("--seed", type=int, default=0, help="seed мира и ботов")
+    parser.add_argument("--balls", type=int, default=INITIAL_BALLS_COUNT, help="стартовое количество шариков")
+    parser.add_argument("--width", type=int, default=SCREEN_WIDTH, help="ширина мира")
+    parser.add_argument("--height", type=int, default=SCREEN_HEIGHT, help="высота мира")
+    parser.add_argument("--sample-interval", type=int, default=FPS, help="тиков между замерами населения")
+    args = parser.parse_args()
+
+    behaviors = [name.strip() for name in args.behaviors.split(",") if name.strip()]
+    unknown = [name for name in behaviors if name not in BOT_BEHAVIORS]
+    if unknown or not behaviors:
+        parser.error(f"Неизвестные поведения: {', '.join(unknown) or '(пусто)'}")
+
+    report = run_load_test(args.bots, behaviors, args.ticks, args.seed, args.balls,
+                           args.width, args.height, args.sample_interval)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
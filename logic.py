@@ -1,9 +1,27 @@
+import gc
 import math
 import random
+import time
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
+from animation import AnimationScheduler, ABSORPTION_DURATION, RELEASE_DURATION
+from collision import find_contacts, approach_speeds, solve_contacts
+from metrics import Histogram, TICK_BUCKETS
+from spawner import (
+    jittered_grid_positions, poisson_disk_positions,
+    random_radii, random_velocities, random_vibrant_colors,
+)
+
+
+# Начиная с такого количества шариков за раз сборщик мусора на время
+# создания выключается (он срабатывает на каждой тысяче новых объектов
+# и на 100k шариков съедает почти половину времени)
+BULK_SPAWN_GC_THRESHOLD = 10000
+
 
 @dataclass
 class Vector2:
@@ -103,10 +121,11 @@ class ColorMixer:
 class Ball:
     """Класс шарика с логикой движения и взаимодействия"""
     
-    def __init__(self, position: Vector2, radius: float = 20, color: Color = None):
-        self.id = random.randint(1000, 9999)  # Уникальный ID
+    def __init__(self, position: Vector2, radius: float = 20, color: Color = None,
+                 velocity: Vector2 = None, ball_id: int = None):
+        self.id = ball_id if ball_id is not None else random.randint(1000, 9999)  # Уникальный ID
         self.position = position
-        self.velocity = Vector2(
+        self.velocity = velocity or Vector2(
             random.uniform(-50, 50),  # Случайная скорость
             random.uniform(-50, 50)
         )
@@ -119,73 +138,41 @@ class Ball:
         self.target_position: Optional[Vector2] = None
         self.absorption_progress = 0.0  # От 0 до 1
         
-    def update(self, dt: float, screen_width: int, screen_height: int):
-        """Обновление состояния шарика"""
+        # Пропущенное время при упрощенной симуляции вне экрана
+        self.pending_dt = 0.0
+        self.pending_ticks = 0
+        
+    def update(self, dt: float, screen_width: int, screen_height: int, ticks: int = 1):
+        """
+        Обновление состояния шарика (анимации ведет AnimationScheduler).
+        ticks > 1 - догоняющее обновление сразу за несколько тиков длиной dt в сумме.
+        """
         if self.state == BallState.FREE:
-            self._update_free_movement(dt, screen_width, screen_height)
-        elif self.state == BallState.BEING_ABSORBED:
-            self._update_absorption(dt)
-        elif self.state == BallState.BEING_RELEASED:
-            self._update_release(dt)
-    
-    def _update_free_movement(self, dt: float, screen_width: int, screen_height: int):
-        """Обновление свободного движения"""
+            self._update_free_movement(dt, screen_width, screen_height, ticks)
+    
+    def _update_free_movement(self, dt: float, screen_width: int, screen_height: int,
+                              ticks: int = 1):
+        """Обновление свободного движения (на месте, без создания новых векторов)"""
+        position, velocity, radius = self.position, self.velocity, self.radius
+        
         # Обновляем позицию
-        self.position = self.position + self.velocity * dt
+        position.x += velocity.x * dt
+        position.y += velocity.y * dt
         
         # Отражение от границ экрана
-        if self.position.x <= self.radius or self.position.x >= screen_width - self.radius:
-            self.velocity.x *= -0.8  # Немного теряем энергию при отражении
-        if self.position.y <= self.radius or self.position.y >= screen_height - self.radius:
-            self.velocity.y *= -0.8
+        if position.x <= radius or position.x >= screen_width - radius:
+            velocity.x *= -0.8  # Немного теряем энергию при отражении
+        if position.y <= radius or position.y >= screen_height - radius:
+            velocity.y *= -0.8
         
         # Корректируем позицию, чтобы шарик не выходил за границы
-        self.position.x = max(self.radius, min(screen_width - self.radius, self.position.x))
-        self.position.y = max(self.radius, min(screen_height - self.radius, self.position.y))
+        position.x = max(radius, min(screen_width - radius, position.x))
+        position.y = max(radius, min(screen_height - radius, position.y))
         
-        # Добавляем небольшое трение
-        friction = 0.99
-        self.velocity = self.velocity * friction
-    
-    def _update_absorption(self, dt: float):
-        """Обновление процесса всасывания"""
-        if self.target_position is None:
-            return
-        
-        self.absorption_progress += dt * 3.0  # Скорость всасывания
-        
-        if self.absorption_progress >= 1.0:
-            self.absorption_progress = 1.0
-            self.state = BallState.IN_INVENTORY
-            self.position = self.target_position
-        else:
-            # Плавное движение к цели
-            start_pos = self.position
-            progress = self._ease_in_out(self.absorption_progress)
-            self.position = Vector2(
-                start_pos.x + (self.target_position.x - start_pos.x) * progress,
-                start_pos.y + (self.target_position.y - start_pos.y) * progress
-            )
-    
-    def _update_release(self, dt: float):
-        """Обновление процесса выплевывания"""
-        self.absorption_progress -= dt * 4.0  # Скорость выплевывания
-        
-        if self.absorption_progress <= 0.0:
-            self.absorption_progress = 0.0
-            self.state = BallState.FREE
-        else:
-            # Плавное движение от цели
-            progress = self._ease_in_out(1.0 - self.absorption_progress)
-            if self.target_position:
-                self.position = Vector2(
-                    self.target_position.x + (self.position.x - self.target_position.x) * progress,
-                    self.target_position.y + (self.position.y - self.target_position.y) * progress
-                )
-    
-    def _ease_in_out(self, t: float) -> float:
-        """Функция сглаживания для плавной анимации"""
-        return t * t * (3.0 - 2.0 * t)
+        # Добавляем небольшое трение (за каждый тик)
+        friction = 0.99 if ticks == 1 else 0.99 ** ticks
+        velocity.x *= friction
+        velocity.y *= friction
     
     def start_absorption(self, target_pos: Vector2):
         """Начать процесс всасывания"""
@@ -196,8 +183,8 @@ class Ball:
     def start_release(self, release_pos: Vector2, release_velocity: Vector2):
         """Начать процесс выплевывания"""
         self.state = BallState.BEING_RELEASED
-        self.position = release_pos
-        self.velocity = release_velocity
+        self.target_position = release_pos
+        self.velocity = Vector2(release_velocity.x, release_velocity.y)
         self.absorption_progress = 1.0
     
     def can_collide_with(self, other: 'Ball') -> bool:
@@ -214,7 +201,7 @@ class Ball:
         distance = self.position.distance_to(other.position)
         return distance <= (self.radius + other.radius)
     
-    def merge_with(self, other: 'Ball') -> 'Ball':
+    def merge_with(self, other: 'Ball', ball_id: int = None) -> 'Ball':
         """Слияние с другим шариком"""
         # Новая позиция - средняя между шариками
         new_pos = Vector2(
@@ -236,10 +223,13 @@ class Ball:
         )
         
         # Создаем новый шарик
-        new_ball = Ball(new_pos, new_radius, new_color)
-        new_ball.velocity = new_velocity
-        
-        return new_ball
+        return Ball(new_pos, new_radius, new_color, new_velocity, ball_id)
+
+
+class CollisionMode(Enum):
+    """Реакция на столкновение шариков"""
+    MERGE = "merge"    # Слияние со смешиванием цветов
+    BOUNCE = "bounce"  # Отскок с учетом масс
 
 
 class DeletionZone:
@@ -305,11 +295,24 @@ class Inventory:
 class GameLogic:
     """Основной класс игровой логики"""
     
-    def __init__(self, screen_width: int = 800, screen_height: int = 600):
+    def __init__(self, screen_width: int = 800, screen_height: int = 600,
+                 seed: Optional[int] = None):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.balls: List[Ball] = []
+        
+        # Генератор случайных чисел мира (воспроизводим по seed)
+        self.rng = np.random.default_rng(seed)
+        self._next_ball_id = 10000  # ID шариков мира не пересекаются со случайными
+        
+        # Счетчики событий (считываются экспортером метрик)
+        self.merge_count = 0
+        self.deletion_count = 0
+        self.tick_count = 0
+        self.tick_histogram = Histogram(TICK_BUCKETS)  # Длительность тика, секунды
+        
         self.inventory = Inventory()
+        self.animations = AnimationScheduler()  # Анимации всасывания/выплевывания
         self.deletion_zone = DeletionZone(
             screen_width - 100, 0, 100, 100  # Правый верхний угол
         )
@@ -318,71 +321,268 @@ class GameLogic:
         self.absorption_radius = 80  # Радиус всасывания мышкой
         self.mouse_position = Vector2(400, 300)
         
+        # Упрощенная симуляция вне экрана: шарики вне active_rect
+        # (left, top, right, bottom) обновляются регионами раз в
+        # offscreen_tick_interval тиков, а при попадании в active_rect
+        # догоняют пропущенное время
+        self.active_rect: Optional[Tuple[float, float, float, float]] = None
+        self.offscreen_tick_interval = 1
+        self.offscreen_region_size = 1000
+        self.active_balls: List[Ball] = []  # Шарики в active_rect на последнем тике
+        self.max_ball_radius = 0.0  # Верхняя оценка радиуса (ширина полосы у границ регионов)
+        
+        # Столкновения: слияние или отскок. В режиме отскока пары, сближающиеся
+        # быстрее merge_speed_threshold, все равно сливаются (None - никогда)
+        self.collision_mode = CollisionMode.MERGE
+        self.restitution = 0.8  # Как при отражении от стен
+        self.merge_speed_threshold: Optional[float] = None
+        self.solver_iterations = 4
+        
         # Генерируем начальные шарики
         self._generate_initial_balls(5)
     
     def _generate_initial_balls(self, count: int):
         """Генерация начальных шариков"""
-        for _ in range(count):
-            # Случайная позиция с отступом от краев
-            pos = Vector2(
-                random.uniform(50, self.screen_width - 50),
-                random.uniform(50, self.screen_height - 50)
-            )
-            
-            # Случайный размер
-            radius = random.uniform(15, 35)
-            
-            ball = Ball(pos, radius)
-            self.balls.append(ball)
+        self.spawn_balls(count)
+    
+    def spawn_balls(self, count: int, radius_range: Tuple[float, float] = (15, 35),
+                    method: str = "grid") -> List[Ball]:
+        """
+        Массовое создание шариков без перекрытий.
+        
+        method="grid" - сетка со случайным смещением (быстро, плотно),
+        method="poisson" - poisson-disk распределение (естественнее выглядит).
+        Шарики не пересекаются ни друг с другом, ни с уже существующими,
+        ни с зоной удаления. Если места не хватает, создается меньше шариков.
+        """
+        if count <= 0:
+            return []
+        
+        radii = random_radii(self.rng, count, radius_range)
+        
+        # Существующие шарики и зона удаления - препятствия
+        obstacles = [(ball.position.x, ball.position.y, ball.radius) for ball in self.balls]
+        zone = self.deletion_zone
+        obstacles.append((
+            zone.x + zone.width / 2, zone.y + zone.height / 2,
+            math.hypot(zone.width, zone.height) / 2
+        ))
+        
+        bounds = (0, 0, self.screen_width, self.screen_height)
+        if method == "grid":
+            positions = jittered_grid_positions(self.rng, radii, bounds, obstacles)
+        elif method == "poisson":
+            positions = poisson_disk_positions(self.rng, radii, bounds, obstacles)
+        else:
+            raise ValueError(f"Неизвестный метод размещения: {method}")
+        
+        return self._add_balls(positions, radii[:len(positions)])
+    
+    def _add_balls(self, positions: np.ndarray, radii: np.ndarray) -> List[Ball]:
+        """Создание шариков в заданных позициях со случайными скоростями и цветами"""
+        spawned = len(positions)
+        velocities = random_velocities(self.rng, spawned).tolist()
+        colors = random_vibrant_colors(self.rng, spawned).tolist()
+        
+        first_id = self._next_ball_id
+        self._next_ball_id += spawned
+        
+        # Массовое заполнение мира - без сборщика мусора; обычные вызовы
+        # (SPACE, боты) его не трогают
+        pause_gc = spawned >= BULK_SPAWN_GC_THRESHOLD and gc.isenabled()
+        if pause_gc:
+            gc.disable()
+        try:
+            new_balls = [
+                Ball(Vector2(x, y), radius, Color(*color), Vector2(vx, vy), first_id + i)
+                for i, ((x, y), radius, (vx, vy), color)
+                in enumerate(zip(positions.tolist(), radii.tolist(), velocities, colors))
+            ]
+        finally:
+            if pause_gc:
+                gc.enable()
+        if spawned:
+            self.max_ball_radius = max(self.max_ball_radius, float(radii.max()))
+        self.balls.extend(new_balls)
+        return new_balls
     
     def update(self, dt: float):
         """Обновление игровой логики"""
-        # Обновляем все шарики
-        for ball in self.balls[:]:  # Копия списка для безопасного изменения
-            ball.update(dt, self.screen_width, self.screen_height)
+        tick_start = time.perf_counter()
+        
+        # Продвигаем все анимации одним шагом (в том числе шариков в инвентаре)
+        for event in self.animations.update(dt):
+            self._finish_animation(event.ball, event.kind)
+        
+        # Обновляем шарики: в active_rect - каждый тик, вне его - по регионам реже
+        rect = self.active_rect if self.offscreen_tick_interval > 1 else None
+        if rect is not None:
+            left, top, right, bottom = rect
+            region_size = self.offscreen_region_size
+            interval = self.offscreen_tick_interval
+            phase = self.tick_count % interval
+            # Шарики, которые не обновляются, но лежат ближе двух радиусов к границе
+            # с обновляемым регионом или с active_rect, могут касаться обновляемых
+            # соседей. Фаза соседа справа/снизу на 1 больше, по диагонали - на 2
+            margin = 2 * self.max_ball_radius
+            far_edge = region_size - margin
+            outer = (left - margin, top - margin, right + margin, bottom + margin)
+        
+        active_balls = []
+        updated_balls = []
+        deleted_balls = []
+        border_balls = []
+        for ball in self.balls:
+            position = ball.position
+            if rect is None or (left <= position.x <= right and top <= position.y <= bottom):
+                active_balls.append(ball)
+            else:
+                region_x, offset_x = divmod(position.x, region_size)
+                region_y, offset_y = divmod(position.y, region_size)
+                lag = (phase - int(region_x + region_y)) % interval
+                if lag:
+                    # Регион не по расписанию - копим пропущенное время
+                    ball.pending_dt += dt
+                    ball.pending_ticks += 1
+                    if ((lag == 1 and (offset_x > far_edge or offset_y > far_edge))
+                            or (lag == interval - 1 and (offset_x < margin or offset_y < margin))
+                            or (lag == 2 and offset_x > far_edge and offset_y > far_edge)
+                            or (lag == interval - 2 and offset_x < margin and offset_y < margin)
+                            or (outer[0] <= position.x <= outer[2] and outer[1] <= position.y <= outer[3])):
+                        border_balls.append(ball)
+                    continue
+            
+            ball.update(dt + ball.pending_dt, self.screen_width, self.screen_height,
+                        1 + ball.pending_ticks)
+            ball.pending_dt = 0.0
+            ball.pending_ticks = 0
             
             # Проверяем удаление в зоне удаления
             if self.deletion_zone.contains_ball(ball):
-                self.balls.remove(ball)
+                deleted_balls.append(ball)
+            else:
+                updated_balls.append(ball)
         
-        # Обновляем шарики в инвентаре
-        for ball in self.inventory.balls:
-            ball.update(dt, self.screen_width, self.screen_height)
+        self.active_balls = active_balls
+        if deleted_balls:
+            self._remove_balls(deleted_balls)
+            self.deletion_count += len(deleted_balls)
         
-        # Проверяем столкновения и слияния
-        self._handle_collisions()
+        # Проверяем столкновения и слияния (сдвинувшиеся шарики и их соседи у границ)
+        self._handle_collisions(updated_balls + border_balls if border_balls else updated_balls)
+        
+        self.tick_count += 1
+        self.tick_histogram.observe(time.perf_counter() - tick_start)
+    
+    def _finish_animation(self, ball: Ball, kind: BallState):
+        """Переключение состояния шарика по завершении анимации"""
+        if kind == BallState.BEING_ABSORBED and ball.state == BallState.BEING_ABSORBED:
+            ball.state = BallState.IN_INVENTORY
+        elif kind == BallState.BEING_RELEASED and ball.state == BallState.BEING_RELEASED:
+            ball.state = BallState.FREE
     
-    def _handle_collisions(self):
-        """Обработка столкновений шариков"""
-        merged_pairs = set()
+    def _handle_collisions(self, candidates: List[Ball] = None):
+        """
+        Обработка столкновений шариков (кандидаты - через пространственную сетку).
+        candidates - шарики для проверки (по умолчанию все).
+        """
+        if candidates is None:
+            candidates = self.balls
+        free_balls = [ball for ball in candidates if ball.state == BallState.FREE]
+        if len(free_balls) < 2:
+            return
         
-        for i, ball1 in enumerate(self.balls):
-            for j, ball2 in enumerate(self.balls[i+1:], i+1):
-                if (i, j) in merged_pairs or (j, i) in merged_pairs:
-                    continue
-                
-                if ball1.collides_with(ball2):
-                    # Создаем новый шарик из слияния
-                    new_ball = ball1.merge_with(ball2)
-                    
-                    # Удаляем старые шарики
-                    self.balls.remove(ball1)
-                    self.balls.remove(ball2)
-                    
-                    # Добавляем новый
-                    self.balls.append(new_ball)
-                    
-                    merged_pairs.add((i, j))
-                    break
+        if self.collision_mode == CollisionMode.MERGE:
+            data = np.array([(ball.position.x, ball.position.y, ball.radius) for ball in free_balls])
+            first, second = find_contacts(data[:, 0], data[:, 1], data[:, 2])
+            self._merge_contacts(free_balls, first, second)
+            return
+        
+        data = np.array([
+            (ball.position.x, ball.position.y, ball.radius,
+             ball.velocity.x, ball.velocity.y, ball.mass)
+            for ball in free_balls
+        ])
+        x, y, radii, vx, vy = (data[:, k].copy() for k in range(5))
+        first, second = find_contacts(x, y, radii)
+        if len(first) == 0:
+            return
+        
+        # Слишком быстрые столкновения сливаются, остальные отскакивают
+        if self.merge_speed_threshold is not None:
+            fast = approach_speeds(x, y, vx, vy, first, second) > self.merge_speed_threshold
+            merged = self._merge_contacts(free_balls, first[fast], second[fast])
+            if merged:
+                merged_indices = np.fromiter(merged, dtype=np.int64)
+                keep = ~fast & ~np.isin(first, merged_indices) & ~np.isin(second, merged_indices)
+            else:
+                keep = ~fast
+            first, second = first[keep], second[keep]
+        
+        solve_contacts(x, y, vx, vy, 1.0 / data[:, 5], radii, first, second,
+                       self.restitution, self.solver_iterations)
+        
+        # Запись результатов только в затронутые шарики
+        touched = np.unique(np.concatenate((first, second)))
+        for i, px, py, pvx, pvy in zip(touched.tolist(), x[touched].tolist(), y[touched].tolist(),
+                                       vx[touched].tolist(), vy[touched].tolist()):
+            ball = free_balls[i]
+            ball.position.x, ball.position.y = px, py
+            ball.velocity.x, ball.velocity.y = pvx, pvy
+    
+    def _merge_contacts(self, free_balls: List[Ball], first: np.ndarray, second: np.ndarray) -> set:
+        """Слияние пар шариков по списку контактов, возвращает индексы слившихся"""
+        # Каждый шарик сливается не больше одного раза за тик
+        merged = set()
+        new_balls = []
+        for i, j in zip(first.tolist(), second.tolist()):
+            if i in merged or j in merged:
+                continue
+            ball1, ball2 = free_balls[i], free_balls[j]
+            if not ball1.can_collide_with(ball2):
+                continue
+            
+            # Создаем новый шарик из слияния
+            new_ball = ball1.merge_with(ball2, self._next_ball_id)
+            self.max_ball_radius = max(self.max_ball_radius, new_ball.radius)
+            new_balls.append(new_ball)
+            self._next_ball_id += 1
+            self.merge_count += 1
+            merged.add(i)
+            merged.add(j)
+        
+        if new_balls:
+            # Удаляем старые шарики и добавляем новые
+            self._remove_balls([free_balls[i] for i in merged])
+            self.balls.extend(new_balls)
+            self.active_balls.extend(new_balls)
+        return merged
+    
+    def _remove_balls(self, removed: List[Ball]):
+        """Удаление шариков из мира и активной области"""
+        for balls in (self.balls, self.active_balls):
+            if len(removed) <= 16:
+                # Поштучное удаление быстрее пересборки большого списка
+                for ball in removed:
+                    if ball in balls:
+                        balls.remove(ball)
+            else:
+                removed_ids = {id(ball) for ball in removed}
+                balls[:] = [ball for ball in balls if id(ball) not in removed_ids]
     
     def set_mouse_position(self, x: float, y: float):
         """Установка позиции мыши"""
         self.mouse_position = Vector2(x, y)
     
-    def try_absorb_ball(self) -> bool:
-        """Попытка всосать шарик мышкой"""
-        if not self.inventory.can_add_ball():
+    def try_absorb_ball(self, cursor: Vector2 = None, inventory: Inventory = None) -> bool:
+        """
+        Попытка всосать шарик мышкой.
+        cursor и inventory позволяют действовать от имени другого игрока
+        (по умолчанию - мышь и инвентарь этой игры).
+        """
+        cursor = cursor or self.mouse_position
+        inventory = inventory or self.inventory
+        if not inventory.can_add_ball():
             return False
         
         # Ищем ближайший шарик в радиусе всасывания
@@ -391,50 +591,59 @@ class GameLogic:
         
         for ball in self.balls:
             if ball.state == BallState.FREE:
-                distance = ball.position.distance_to(self.mouse_position)
+                distance = ball.position.distance_to(cursor)
                 if distance <= self.absorption_radius and distance < closest_distance:
                     closest_ball = ball
                     closest_distance = distance
         
         if closest_ball:
             self.balls.remove(closest_ball)
-            self.inventory.add_ball(closest_ball)
+            inventory.add_ball(closest_ball)
+            self.animations.start(
+                closest_ball, BallState.BEING_ABSORBED,
+                closest_ball.position, closest_ball.target_position,
+                ABSORPTION_DURATION
+            )
             return True
         
         return False
     
-    def release_ball(self, direction: Vector2 = None) -> bool:
+    def release_ball(self, direction: Vector2 = None, cursor: Vector2 = None,
+                     inventory: Inventory = None) -> bool:
         """Выплевывание шарика из инвентаря"""
-        ball = self.inventory.remove_ball()
+        cursor = cursor or self.mouse_position
+        inventory = inventory or self.inventory
+        ball = inventory.remove_ball()
         if ball is None:
             return False
         
         # Позиция выплевывания - рядом с мышкой
-        release_pos = Vector2(
-            self.mouse_position.x + random.uniform(-30, 30),
-            self.mouse_position.y + random.uniform(-30, 30)
-        )
+        offset_x, offset_y = self.rng.uniform(-30, 30, 2).tolist()
+        release_pos = Vector2(cursor.x + offset_x, cursor.y + offset_y)
         
         # Скорость выплевывания
         if direction is None:
-            direction = Vector2(
-                random.uniform(-100, 100),
-                random.uniform(-100, 100)
-            )
+            direction = Vector2(*self.rng.uniform(-100, 100, 2).tolist())
         
+        # Летит из слота инвентаря к точке выплевывания
+        start_pos = Vector2(ball.position.x, ball.position.y)
         ball.start_release(release_pos, direction)
+        self.animations.start(
+            ball, BallState.BEING_RELEASED, start_pos, release_pos,
+            RELEASE_DURATION, reverse=True
+        )
         self.balls.append(ball)
         return True
     
     def add_random_ball(self):
-        """Добавление случайного шарика"""
-        pos = Vector2(
-            random.uniform(50, self.screen_width - 50),
-            random.uniform(50, self.screen_height - 50)
-        )
-        radius = random.uniform(15, 35)
-        ball = Ball(pos, radius)
-        self.balls.append(ball)
+        """Добавление случайного шарика (всегда добавляет один шарик)"""
+        if self.spawn_balls(1, method="poisson"):
+            return
+        
+        # Свободного места не нашлось - ставим в случайную точку, как раньше
+        radii = random_radii(self.rng, 1, (15, 35))
+        position = self.rng.uniform((50, 50), (self.screen_width - 50, self.screen_height - 50), (1, 2))
+        self._add_balls(position, radii)
     
     def get_game_state(self) -> dict:
         """Получение текущего состояния игры для интерфейса"""
@@ -0,0 +1,216 @@
+"""
+Метрики долгих игровых сессий в текстовом формате Prometheus.
+
+Игровой цикл только увеличивает целочисленные счетчики и раскладывает
+длительности по заранее созданным корзинам гистограмм - без создания
+списков, словарей и строк на тик. Значения считываются и форматируются
+только в момент опроса: через HTTP (/metrics) или периодической
+записью в файл.
+"""
+
+import atexit
+import os
+import sys
+import threading
+from bisect import bisect_left
+from typing import Callable, List, Optional, Tuple
+
+
+# Корзины длительности тика логики и кадра, секунды
+TICK_BUCKETS = (0.0005, 0.001, 0.002, 0.004, 0.008, 0.016, 0.033, 0.066, 0.125, 0.25, 0.5, 1.0)
+FRAME_BUCKETS = (0.002, 0.004, 0.008, 0.0125, 0.0166, 0.025, 0.033, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Переменные окружения для включения экспорта
+ENV_PORT = "BALLGAME_METRICS_PORT"
+ENV_HOST = "BALLGAME_METRICS_HOST"
+ENV_FILE = "BALLGAME_METRICS_FILE"
+ENV_INTERVAL = "BALLGAME_METRICS_INTERVAL"
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Последняя корзина - +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Учет одного значения"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def resident_memory_bytes() -> Optional[int]:
+    """Текущий объем резидентной памяти процесса (None без /proc)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def peak_resident_memory_bytes() -> Optional[int]:
+    """Пиковый объем резидентной памяти процесса (None на Windows)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss - в байтах на macOS, в килобайтах на Linux и BSD
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MetricsRegistry:
+    """Реестр метрик, значения которых считываются при опросе"""
+
+    def __init__(self):
+        self._metrics: List[Tuple[str, str, str, object]] = []  # (имя, тип, описание, источник)
+
+    def counter(self, name: str, help_text: str, func: Callable[[], float]):
+        """Счетчик, значение берется из func"""
+        self._metrics.append((name, "counter", help_text, func))
+
+    def gauge(self, name: str, help_text: str, func: Callable[[], float]):
+        """Мгновенное значение, берется из func"""
+        self._metrics.append((name, "gauge", help_text, func))
+
+    def histogram(self, name: str, help_text: str, histogram: Histogram):
+        """Гистограмма"""
+        self._metrics.append((name, "histogram", help_text, histogram))
+
+    def render(self) -> str:
+        """Текстовое представление всех метрик в формате Prometheus"""
+        lines = []
+        for name, kind, help_text, source in self._metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            if kind == "histogram":
+                cumulative = 0
+                for bound, count in zip(source.buckets, source.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{le="+Inf"}} {source.count}')
+                lines.append(f"{name}_sum {source.sum}")
+                lines.append(f"{name}_count {source.count}")
+            else:
+                lines.append(f"{name} {source()}")
+        return "\n".join(lines) + "\n"
+
+
+def register_game_metrics(registry: MetricsRegistry, game_logic):
+    """Метрики игровой логики и процесса"""
+    registry.counter("ballgame_ticks_total", "Количество тиков логики",
+                     lambda: game_logic.tick_count)
+    registry.histogram("ballgame_tick_duration_seconds", "Длительность тика логики",
+                       game_logic.tick_histogram)
+    registry.gauge("ballgame_balls", "Шариков в мире",
+                   lambda: len(game_logic.balls))
+    registry.counter("ballgame_merges_total", "Количество слияний",
+                     lambda: game_logic.merge_count)
+    registry.counter("ballgame_deletions_total", "Шариков удалено в зоне удаления",
+                     lambda: game_logic.deletion_count)
+    registry.gauge("ballgame_inventory_used_slots", "Занятые слоты инвентаря",
+                   lambda: len(game_logic.inventory.balls))
+    registry.gauge("ballgame_inventory_max_slots", "Размер инвентаря",
+                   lambda: game_logic.inventory.max_size)
+    # Метрики памяти регистрируются, только если платформа их отдает
+    if resident_memory_bytes() is not None:
+        registry.gauge("process_resident_memory_bytes", "Резидентная память процесса",
+                       resident_memory_bytes)
+    if peak_resident_memory_bytes() is not None:
+        registry.gauge("process_max_resident_memory_bytes", "Пиковая резидентная память процесса",
+                       peak_resident_memory_bytes)
+
+
+def register_frame_metrics(registry: MetricsRegistry, ball_game):
+    """Метрики отрисовки графической игры"""
+    registry.counter("ballgame_frames_total", "Количество отрисованных кадров",
+                     lambda: ball_game.frame_count)
+    registry.histogram("ballgame_frame_duration_seconds", "Время работы кадра (логика и отрисовка)",
+                       ball_game.frame_histogram)
+
+
+def start_http_server(registry: MetricsRegistry, port: int, host: str = "127.0.0.1"):
+    """Запуск HTTP-эндпоинта метрик в фоновом потоке"""
+    # http.server импортируется только при включенном экспорте
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        """Обработчик запросов /metrics"""
+
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            """Запросы не логируются, чтобы не засорять вывод игры"""
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def start_file_dump(registry: MetricsRegistry, path: str, interval: float = 15.0) -> threading.Event:
+    """
+    Периодическая запись метрик в файл (атомарной заменой) в фоновом потоке
+    и последняя запись при завершении процесса, поэтому файл появляется и
+    после прогонов короче интервала. Ошибки записи выводятся, запись
+    продолжается. Возвращает событие, установка которого останавливает запись.
+    """
+    stop = threading.Event()
+
+    def write_dump():
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as dump:
+                dump.write(registry.render())
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ Не удалось записать метрики в {path}: {e}")
+
+    def dump_loop():
+        while not stop.wait(interval):
+            write_dump()
+
+    def final_dump():
+        if not stop.is_set():
+            write_dump()
+
+    threading.Thread(target=dump_loop, name="metrics-file", daemon=True).start()
+    atexit.register(final_dump)
+    return stop
+
+
+def start_exporters_from_env(registry: MetricsRegistry):
+    """
+    Включение экспорта по переменным окружения BALLGAME_METRICS_*.
+    Ошибки (занятый порт, неверные значения) только выводятся:
+    метрики не должны прерывать игровую сессию.
+    """
+    port = os.environ.get(ENV_PORT)
+    if port:
+        host = os.environ.get(ENV_HOST, "127.0.0.1")
+        try:
+            start_http_server(registry, int(port), host)
+            print(f"📈 Метрики: http://{host}:{port}/metrics")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ HTTP-экспорт метрик не запущен ({host}:{port}): {e}")
+
+    path = os.environ.get(ENV_FILE)
+    if path:
+        try:
+            start_file_dump(registry, path, float(os.environ.get(ENV_INTERVAL, "15")))
+            print(f"📈 Метрики пишутся в файл: {path}")
+        except ValueError as e:
+            print(f"⚠️ Запись метрик в файл не запущена: {e}")
@@ -0,0 +1,91 @@
+"""
+Адаптивное качество отрисовки.
+
+Контроллер следит за временем последних кадров и при перегрузке
+понижает детализацию (блики, обводки, эффекты, частота обновления
+интерфейса), а при наличии запаса - возвращает ее обратно.
+Модуль не зависит от pygame.
+"""
+
+from dataclasses import dataclass
+
+from settings import FPS
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """Набор настроек детализации отрисовки"""
+    name: str
+    draw_highlights: bool     # Блики на шариках
+    draw_outlines: bool       # Обводка шариков
+    draw_effects: bool        # Кольца эффектов всасывания/выплевывания
+    lod_radius: int           # Шарики меньше этого радиуса рисуются квадратом
+    ui_refresh_interval: int  # Перерисовка интерфейса раз в N кадров
+
+
+# Уровни качества от лучшего к худшему
+QUALITY_LEVELS = [
+    QualityLevel("Высокое", True, True, True, 0, 1),
+    QualityLevel("Среднее", False, True, True, 3, 2),
+    QualityLevel("Низкое", False, False, False, 3, 4),
+    QualityLevel("Минимальное", False, False, False, 5, 10),
+]
+
+
+class QualityController:
+    """Контроллер уровня качества по времени кадра"""
+
+    def __init__(self, frame_budget_ms: float = 1000.0 / FPS, window: int = 30,
+                 upgrade_ratio: float = 0.6, upgrade_delay: int = 120):
+        self.frame_budget_ms = frame_budget_ms
+        self.upgrade_ratio = upgrade_ratio  # Доля бюджета, ниже которой есть запас
+        self.upgrade_delay = upgrade_delay  # Кадров с запасом до повышения качества
+        self.level_index = 0
+
+        # Кольцевой буфер времени последних кадров
+        self._samples = [0.0] * window
+        self._position = 0
+        self._filled = 0
+        self._total = 0.0
+        self._headroom_frames = 0
+
+    @property
+    def level(self) -> QualityLevel:
+        """Текущий уровень качества"""
+        return QUALITY_LEVELS[self.level_index]
+
+    @property
+    def average_frame_ms(self) -> float:
+        """Среднее время кадра по окну"""
+        return self._total / self._filled if self._filled else 0.0
+
+    def record_frame(self, frame_ms: float):
+        """Учет времени очередного кадра и при необходимости смена уровня"""
+        window = len(self._samples)
+        self._total += frame_ms - self._samples[self._position]
+        self._samples[self._position] = frame_ms
+        self._position = (self._position + 1) % window
+        self._filled = min(self._filled + 1, window)
+        if self._filled < window:
+            return
+
+        average = self.average_frame_ms
+        if average > self.frame_budget_ms:
+            self._headroom_frames = 0
+            if self.level_index < len(QUALITY_LEVELS) - 1:
+                self._set_level(self.level_index + 1)
+        elif average < self.frame_budget_ms * self.upgrade_ratio:
+            self._headroom_frames += 1
+            if self._headroom_frames >= self.upgrade_delay and self.level_index > 0:
+                self._set_level(self.level_index - 1)
+        else:
+            self._headroom_frames = 0
+
+    def _set_level(self, index: int):
+        """Смена уровня с очисткой окна, чтобы решение принималось по новым кадрам"""
+        self.level_index = index
+        self._samples = [0.0] * len(self._samples)
+        self._position = 0
+        self._filled = 0
+        self._total = 0.0
+        self._headroom_frames = 0
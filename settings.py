@@ -0,0 +1,38 @@
+"""
+Общие настройки игры.
+
+Модуль не зависит от pygame, поэтому его можно импортировать из
+безголовых инструментов без инициализации SDL.
+"""
+
+# Константы
+SCREEN_WIDTH = 1000
+SCREEN_HEIGHT = 700
+FPS = 60
+BACKGROUND_COLOR = (255, 255, 255)  # Белый фон
+
+# Цвета интерфейса
+UI_COLOR = (240, 240, 240)
+BORDER_COLOR = (200, 200, 200)
+TEXT_COLOR = (50, 50, 50)
+DELETION_ZONE_COLOR = (255, 100, 100, 100)  # Полупрозрачный красный
+ABSORPTION_CIRCLE_COLOR = (100, 150, 255, 80)  # Полупрозрачный синий
+DELETION_TEXT_COLOR = (255, 0, 0)
+
+# Настройки игры
+INITIAL_BALLS_COUNT = 8  # Стартовое количество шариков
+
+# Размер мира (по умолчанию совпадает с окном) и камера
+WORLD_WIDTH = SCREEN_WIDTH
+WORLD_HEIGHT = SCREEN_HEIGHT
+CAMERA_PAN_SPEED = 800  # Экранных пикселей в секунду
+CAMERA_ZOOM_STEP = 1.1  # Множитель масштаба за один шаг колеса
+
+# Шарики вне экрана обновляются раз в столько тиков (1 - всегда полностью)
+OFFSCREEN_TICK_INTERVAL = 6
+ACTIVE_MARGIN = 100  # Запас вокруг окна, где симуляция всегда полная
+
+# Столкновения шариков: "merge" - слияние, "bounce" - отскок
+COLLISION_MODE = "merge"
+RESTITUTION = 0.8  # Упругость отскока (1.0 - без потерь)
+MERGE_SPEED_THRESHOLD = None  # В режиме отскока сливать пары, сближающиеся быстрее (None - никогда)
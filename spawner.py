@@ -0,0 +1,204 @@
+"""
+Массовое создание шариков без перекрытий.
+
+Позиции выбираются либо по сетке со случайным смещением внутри ячеек
+(метод "grid"), либо параллельным poisson-disk сэмплированием (метод
+"poisson"). Оба метода используют пространственную сетку, поэтому
+стоимость не зависит квадратично от количества шариков. Радиусы,
+скорости и цвета генерируются векторизованно из генератора мира.
+"""
+
+import math
+from typing import Iterable, Tuple
+
+import numpy as np
+
+
+# Палитра ярких цветов (та же, что в Color.random_vibrant)
+VIBRANT_PALETTE = np.array([
+    (255, 100, 100),  # Красный
+    (100, 255, 100),  # Зеленый
+    (100, 100, 255),  # Синий
+    (255, 255, 100),  # Желтый
+    (255, 100, 255),  # Пурпурный
+    (100, 255, 255),  # Циан
+    (255, 150, 50),   # Оранжевый
+    (150, 50, 255),   # Фиолетовый
+], dtype=np.int16)
+
+# Смещения соседних ячеек для poisson-disk проверки (окрестность 5x5 без углов)
+_NEIGHBOR_OFFSETS = np.array(
+    [(dy, dx) for dy in range(-2, 3) for dx in range(-2, 3) if abs(dy) + abs(dx) < 4],
+    dtype=np.int64
+)
+
+
+def random_radii(rng: np.random.Generator, count: int,
+                 radius_range: Tuple[float, float]) -> np.ndarray:
+    """Случайные радиусы в заданном диапазоне"""
+    return rng.uniform(radius_range[0], radius_range[1], count)
+
+
+def random_velocities(rng: np.random.Generator, count: int,
+                      max_speed: float = 50) -> np.ndarray:
+    """Случайные скорости, массив формы (count, 2)"""
+    return rng.uniform(-max_speed, max_speed, (count, 2))
+
+
+def random_vibrant_colors(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Случайные яркие цвета с отклонением, массив формы (count, 3)"""
+    base = VIBRANT_PALETTE[rng.integers(0, len(VIBRANT_PALETTE), count)]
+    jitter = rng.integers(-30, 31, (count, 3), dtype=np.int16)
+    return np.clip(base + jitter, 0, 255)
+
+
+def _blocked_cells(shape: Tuple[int, int], cell_size: float,
+                   origin: Tuple[float, float],
+                   obstacles: Iterable[Tuple[float, float, float]],
+                   padding: float) -> np.ndarray:
+    """Маска ячеек сетки, пересекающихся с уже существующими шариками"""
+    rows, cols = shape
+    blocked = np.zeros(shape, dtype=bool)
+    ox, oy = origin
+    for x, y, radius in obstacles:
+        reach = radius + padding
+        x0 = max(0, int((x - reach - ox) // cell_size))
+        x1 = min(cols - 1, int((x + reach - ox) // cell_size))
+        y0 = max(0, int((y - reach - oy) // cell_size))
+        y1 = min(rows - 1, int((y + reach - oy) // cell_size))
+        if x0 <= x1 and y0 <= y1:
+            blocked[y0:y1 + 1, x0:x1 + 1] = True
+    return blocked
+
+
+def jittered_grid_positions(rng: np.random.Generator, radii: np.ndarray,
+                            bounds: Tuple[float, float, float, float],
+                            obstacles: Iterable[Tuple[float, float, float]] = ()
+                            ) -> np.ndarray:
+    """
+    Позиции по сетке со случайным смещением внутри ячейки.
+
+    Размер ячейки равен диаметру самого большого шарика, в каждую ячейку
+    попадает не больше одного шарика, а смещение ограничено так, чтобы
+    шарик не выходил за ячейку - перекрытия исключены по построению.
+    bounds = (left, top, right, bottom) ограничивают шарики целиком.
+    Возвращает массив (n, 2), где n <= len(radii), если места не хватило.
+    """
+    left, top, right, bottom = bounds
+    count = len(radii)
+    if count == 0:
+        return np.empty((0, 2))
+
+    cell_size = 2.0 * float(radii.max())
+    cols = int((right - left) // cell_size)
+    rows = int((bottom - top) // cell_size)
+    if cols <= 0 or rows <= 0:
+        return np.empty((0, 2))
+
+    blocked = _blocked_cells((rows, cols), cell_size, (left, top), obstacles, 0.0)
+    free_cells = np.flatnonzero(~blocked.ravel())
+    count = min(count, len(free_cells))
+    cells = rng.choice(free_cells, size=count, replace=False)
+
+    # Свобода смещения центра внутри ячейки
+    slack = cell_size / 2.0 - radii[:count]
+    jitter = rng.uniform(-1.0, 1.0, (count, 2)) * slack[:, None]
+
+    positions = np.empty((count, 2))
+    positions[:, 0] = left + (cells % cols + 0.5) * cell_size + jitter[:, 0]
+    positions[:, 1] = top + (cells // cols + 0.5) * cell_size + jitter[:, 1]
+    return positions
+
+
+def poisson_disk_positions(rng: np.random.Generator, radii: np.ndarray,
+                           bounds: Tuple[float, float, float, float],
+                           obstacles: Iterable[Tuple[float, float, float]] = (),
+                           max_rounds: int = 30) -> np.ndarray:
+    """
+    Poisson-disk позиции с минимальным расстоянием в диаметр
+    самого большого шарика (шарики целиком внутри bounds).
+
+    Кандидаты бросаются пачками, принимаются через сетку с ячейкой
+    d/sqrt(2) (в ячейке не больше одной точки) и проверяются по
+    окрестности 5x5 как против уже принятых точек, так и против
+    кандидатов той же пачки с более высоким приоритетом.
+    Возвращает массив (n, 2), где n <= len(radii), если место кончилось.
+    """
+    left, top, right, bottom = bounds
+    count = len(radii)
+    if count == 0:
+        return np.empty((0, 2))
+
+    min_dist = 2.0 * float(radii.max())
+    min_dist_sq = min_dist * min_dist
+    # Центры выбираются так, чтобы шарик целиком помещался в границы
+    left, top = left + min_dist / 2.0, top + min_dist / 2.0
+    right, bottom = right - min_dist / 2.0, bottom - min_dist / 2.0
+    if right <= left or bottom <= top:
+        return np.empty((0, 2))
+    cell_size = min_dist / math.sqrt(2.0)
+    cols = int(math.ceil((right - left) / cell_size))
+    rows = int(math.ceil((bottom - top) / cell_size))
+
+    # Сетка с запасом в 2 ячейки по краям, чтобы не проверять границы
+    owner = np.full((rows + 4, cols + 4), -1, dtype=np.int64)
+    blocked = np.zeros_like(owner, dtype=bool)
+    blocked[2:-2, 2:-2] = _blocked_cells(
+        (rows, cols), cell_size, (left, top), obstacles, min_dist / 2.0
+    )
+
+    pending = np.full_like(owner, -1)  # Кандидаты текущей пачки
+    accepted = np.empty((count, 2))
+    accepted_count = 0
+
+    for _ in range(max_rounds):
+        need = count - accepted_count
+        if need <= 0:
+            break
+        batch = rng.uniform((left, top), (right, bottom), (max(need * 2, 64), 2))
+        cx = ((batch[:, 0] - left) // cell_size).astype(np.int64) + 2
+        cy = ((batch[:, 1] - top) // cell_size).astype(np.int64) + 2
+
+        # Отбрасываем занятые ячейки и оставляем по одному кандидату на ячейку
+        keep = (owner[cy, cx] < 0) & ~blocked[cy, cx]
+        idx = np.flatnonzero(keep)
+        _, first = np.unique(cy[idx] * (cols + 4) + cx[idx], return_index=True)
+        idx = idx[np.sort(first)]
+        if len(idx) == 0:
+            continue
+        batch, cx, cy = batch[idx], cx[idx], cy[idx]
+
+        ny = cy[:, None] + _NEIGHBOR_OFFSETS[:, 0]
+        nx = cx[:, None] + _NEIGHBOR_OFFSETS[:, 1]
+
+        bx, by = batch[:, 0:1], batch[:, 1:2]
+
+        # Проверка против уже принятых точек
+        if accepted_count:
+            neighbors = owner[ny, nx]
+            has = neighbors >= 0
+            near = neighbors[has]
+            dist_sq = np.zeros(neighbors.shape)
+            dist_sq[has] = ((accepted[near, 0] - np.broadcast_to(bx, has.shape)[has]) ** 2 +
+                            (accepted[near, 1] - np.broadcast_to(by, has.shape)[has]) ** 2)
+            ok = ~(has & (dist_sq < min_dist_sq)).any(axis=1)
+        else:
+            ok = np.ones(len(batch), dtype=bool)
+
+        # Проверка внутри пачки: кандидат с меньшим индексом имеет приоритет
+        pending[cy, cx] = np.arange(len(batch))
+        rivals = pending[ny, nx]
+        pending[cy, cx] = -1
+        has = (rivals >= 0) & (rivals < np.arange(len(batch))[:, None])
+        near = rivals[has]
+        dist_sq = np.zeros(rivals.shape)
+        dist_sq[has] = ((batch[near, 0] - np.broadcast_to(bx, has.shape)[has]) ** 2 +
+                        (batch[near, 1] - np.broadcast_to(by, has.shape)[has]) ** 2)
+        ok &= ~(has & (dist_sq < min_dist_sq)).any(axis=1)
+
+        new = np.flatnonzero(ok)[:need]
+        owner[cy[new], cx[new]] = np.arange(accepted_count, accepted_count + len(new))
+        accepted[accepted_count:accepted_count + len(new)] = batch[new]
+        accepted_count += len(new)
+
+    return accepted[:accepted_count]
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Измерение времени запуска.
+
+Каждый сценарий выполняется в отдельном процессе несколько раз,
+из медианы вычитается время запуска пустого интерпретатора.
+Сценарий "pygame.init()" воспроизводит старый путь запуска, когда
+pygame полностью инициализировался при импорте game.py.
+Без DISPLAY используется SDL_VIDEODRIVER=dummy.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+SCENARIOS = [
+    ("пустой интерпретатор", "pass"),
+    ("headless: import logic", "import logic"),
+    ("headless: 60 тиков", "import headless; headless.run_simulation(60, seed=0)"),
+    ("gui: import game", "import game"),
+    ("gui: import game + pygame.init() + 2 шрифта (старый путь)",
+     "import game, pygame; pygame.init(); pygame.font.Font(None, 24); pygame.font.Font(None, 18)"),
+    ("gui: BallGame() + первый кадр",
+     "import game; g = game.BallGame(); g.render()"),
+]
+
+
+def measure(code: str, runs: int, env: dict) -> float:
+    """Медианное время выполнения кода в новом процессе, секунды"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                       stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    """Точка входа измерения"""
+    parser = argparse.ArgumentParser(description="Время запуска игры и безголовых воркеров")
+    parser.add_argument("--runs", type=int, default=5, help="запусков на сценарий")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    if not env.get("DISPLAY"):
+        env["SDL_VIDEODRIVER"] = "dummy"
+        env["SDL_AUDIODRIVER"] = "dummy"
+
+    baseline = None
+    for name, code in SCENARIOS:
+        elapsed = measure(code, args.runs, env)
+        if baseline is None:
+            baseline = elapsed
+            print(f"{name:<60} {elapsed * 1000:8.1f} мс")
+        else:
+            print(f"{name:<60} {(elapsed - baseline) * 1000:8.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Пакетная симуляция множества независимых миров для подбора параметров.
+
+Вместо отдельного GameLogic на каждый прогон все миры хранятся в
+массивах формы (миры, шарики) и продвигаются одним векторизованным
+шагом за тик. Параметры (трение, радиус всасывания, коэффициент
+радиуса при слиянии, упругость стен) задаются отдельно для каждого
+мира. Правила повторяют GameLogic: движение с отражением от стен,
+зона удаления, слияния (каждый шарик - не больше одного раза за тик,
+пары перебираются в порядке списка GameLogic.balls, где слитый шарик
+добавляется в конец) и курсор, периодически всасывающий ближайший
+шарик в инвентарь. Без курсора результат совпадает с GameLogic,
+запущенным из тех же начальных шариков. Модуль не зависит от pygame.
+"""
+
+import argparse
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, INITIAL_BALLS_COUNT
+from spawner import jittered_grid_positions, random_radii, random_velocities, random_vibrant_colors
+
+
+# Значения по умолчанию - те же, что зашиты в Ball и GameLogic
+DEFAULT_FRICTION = 0.99
+DEFAULT_ABSORPTION_RADIUS = 80.0
+DEFAULT_MERGE_RADIUS_FACTOR = 0.8
+DEFAULT_WALL_RESTITUTION = 0.8
+INVENTORY_SIZE = 10
+DELETION_ZONE_SIZE = 100  # Квадрат в правом верхнем углу
+
+
+def is_white(colors: np.ndarray, threshold: int = 240) -> np.ndarray:
+    """Векторный аналог Color.is_white для массива цветов (..., 3)"""
+    return (colors >= threshold).all(axis=-1)
+
+
+@dataclass
+class BatchResult:
+    """Итоговая статистика по мирам (массивы длины количества миров)"""
+    final_count: np.ndarray     # Шариков в мире
+    white_count: np.ndarray     # Из них почти белых (Color.is_white)
+    merge_count: np.ndarray
+    deletion_count: np.ndarray
+    absorbed_count: np.ndarray  # Шариков в инвентаре
+
+    @property
+    def white_fraction(self) -> np.ndarray:
+        """Доля почти белых шариков в мире (0 для пустых миров)"""
+        return self.white_count / np.maximum(self.final_count, 1)
+
+
+class BatchSimulation:
+    """Состояние W независимых миров одного размера"""
+
+    def __init__(self, worlds: int, balls: int = INITIAL_BALLS_COUNT,
+                 width: int = SCREEN_WIDTH, height: int = SCREEN_HEIGHT,
+                 seed: int = None, friction=DEFAULT_FRICTION,
+                 absorption_radius=DEFAULT_ABSORPTION_RADIUS,
+                 merge_radius_factor=DEFAULT_MERGE_RADIUS_FACTOR,
+                 wall_restitution=DEFAULT_WALL_RESTITUTION,
+                 absorb_interval: int = FPS // 2, first_world: int = 0):
+        """
+        Параметры мира - число (общее для всех) или массив длины worlds.
+        absorb_interval - курсор в центре мира всасывает раз в столько
+        тиков (0 - без всасывания). first_world - номер первого мира при
+        разбиении перебора на пакеты: мир с номером k получает один и тот
+        же генератор независимо от размера пакета.
+        """
+        self.worlds = worlds
+        self.width = width
+        self.height = height
+        self.friction = self._per_world(friction)
+        self.absorption_radius = self._per_world(absorption_radius)
+        self.merge_radius_factor = self._per_world(merge_radius_factor)
+        self.wall_restitution = self._per_world(wall_restitution)
+        self.absorb_interval = absorb_interval
+        self.cursor = (width / 2, height / 2)
+        self.tick_count = 0
+
+        # Состояние шариков: (миры, шарики); пустые слоты - alive=False
+        self.x = np.zeros((worlds, balls))
+        self.y = np.zeros((worlds, balls))
+        self.vx = np.zeros((worlds, balls))
+        self.vy = np.zeros((worlds, balls))
+        self.radius = np.ones((worlds, balls))
+        self.colors = np.zeros((worlds, balls, 3), dtype=np.int16)
+        self.alive = np.zeros((worlds, balls), dtype=bool)
+
+        # Порядок шариков в списке GameLogic.balls: слитый шарик добавляется
+        # в конец, поэтому получает следующий номер, хотя занимает старый слот
+        self.sequence = np.tile(np.arange(balls), (worlds, 1))
+        self._next_sequence = np.full(worlds, balls, dtype=np.int64)
+
+        self.merge_count = np.zeros(worlds, dtype=np.int64)
+        self.deletion_count = np.zeros(worlds, dtype=np.int64)
+        self.absorbed_count = np.zeros(worlds, dtype=np.int64)
+
+        self._spawn(balls, seed, first_world)
+
+    def _per_world(self, value) -> np.ndarray:
+        """Параметр в виде массива длины worlds"""
+        return np.broadcast_to(np.asarray(value, dtype=float), (self.worlds,)).copy()
+
+    def _spawn(self, balls: int, seed: int, first_world: int):
+        """Стартовые шарики, как в GameLogic.spawn_balls (у каждого мира свой генератор)"""
+        zone = DELETION_ZONE_SIZE
+        obstacles = [(self.width - zone / 2, zone / 2, math.hypot(zone, zone) / 2)]
+        bounds = (0, 0, self.width, self.height)
+        entropy = np.random.SeedSequence(seed).entropy
+        for world in range(self.worlds):
+            rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(first_world + world,)))
+            radii = random_radii(rng, balls, (15, 35))
+            positions = jittered_grid_positions(rng, radii, bounds, obstacles)
+            count = len(positions)
+            self.x[world, :count] = positions[:, 0]
+            self.y[world, :count] = positions[:, 1]
+            self.radius[world, :count] = radii[:count]
+            velocities = random_velocities(rng, count)
+            self.vx[world, :count] = velocities[:, 0]
+            self.vy[world, :count] = velocities[:, 1]
+            self.colors[world, :count] = random_vibrant_colors(rng, count)
+            self.alive[world, :count] = True
+
+    def step(self, dt: float):
+        """Один тик всех миров"""
+        if self.absorb_interval > 0 and self.tick_count % self.absorb_interval == 0:
+            self._absorb()
+        self._move(dt)
+        self._delete_in_zone()
+        self._merge()
+        self.tick_count += 1
+
+    def _absorb(self):
+        """Всасывание ближайшего шарика в радиусе курсора (как try_absorb_ball)"""
+        distance = np.hypot(self.x - self.cursor[0], self.y - self.cursor[1])
+        distance = np.where(self.alive, distance, np.inf)
+        closest = distance.argmin(axis=1)
+        worlds = np.arange(self.worlds)
+        absorb = ((distance[worlds, closest] <= self.absorption_radius)
+                  & (self.absorbed_count < INVENTORY_SIZE))
+        self.alive[worlds[absorb], closest[absorb]] = False
+        self.absorbed_count += absorb
+
+    def _move(self, dt: float):
+        """Движение с отражением от стен и трением (как Ball._update_free_movement)"""
+        x, y, vx, vy, radius = self.x, self.y, self.vx, self.vy, self.radius
+        x += vx * dt
+        y += vy * dt
+
+        bounce = -self.wall_restitution[:, None]
+        vx *= np.where((x <= radius) | (x >= self.width - radius), bounce, 1.0)
+        vy *= np.where((y <= radius) | (y >= self.height - radius), bounce, 1.0)
+
+        np.clip(x, radius, self.width - radius, out=x)
+        np.clip(y, radius, self.height - radius, out=y)
+
+        friction = self.friction[:, None]
+        vx *= friction
+        vy *= friction
+
+    def _delete_in_zone(self):
+        """Удаление шариков, центр которых в зоне удаления"""
+        inside = self.alive & (self.x >= self.width - DELETION_ZONE_SIZE) & (self.y <= DELETION_ZONE_SIZE)
+        if inside.any():
+            self.alive &= ~inside
+            self.deletion_count += inside.sum(axis=1)
+
+    def _find_contacts(self):
+        """
+        Касающиеся пары слотов (мир, i, j), где i раньше j в списке
+        GameLogic.balls, упорядоченные по (мир, номер i, номер j) - как
+        контакты в GameLogic. Шарики каждого мира сортируются по x, и сравниваются
+        только соседи по сортировке на расстоянии d = 1, 2, ..., пока хотя
+        бы в одном мире разрыв по x меньше максимальной суммы радиусов.
+        Точная проверка - только для пар, близких и по y.
+        """
+        if not self.alive.any():
+            return None
+        x = np.where(self.alive, self.x, np.inf)
+        order = np.argsort(x, axis=1)
+        sorted_x = np.take_along_axis(x, order, axis=1)
+        sorted_y = np.take_along_axis(self.y, order, axis=1)
+        max_reach = 2.0 * self.radius[self.alive].max()
+
+        worlds, firsts, seconds = [], [], []
+        for offset in range(1, sorted_x.shape[1]):
+            # inf - inf = nan, поэтому пустые слоты в пары не попадают
+            with np.errstate(invalid="ignore"):
+                near = sorted_x[:, offset:] - sorted_x[:, :-offset] <= max_reach
+            if not near.any():
+                break
+            near &= np.abs(sorted_y[:, offset:] - sorted_y[:, :-offset]) <= max_reach
+            world, slot = np.nonzero(near)
+            worlds.append(world)
+            firsts.append(order[world, slot])
+            seconds.append(order[world, slot + offset])
+        if not worlds:
+            return None
+
+        world = np.concatenate(worlds)
+        first = np.concatenate(firsts)
+        second = np.concatenate(seconds)
+        reach = self.radius[world, first] + self.radius[world, second]
+        touching = ((self.x[world, first] - self.x[world, second]) ** 2
+                    + (self.y[world, first] - self.y[world, second]) ** 2 <= reach * reach)
+        world, first, second = world[touching], first[touching], second[touching]
+        swap = self.sequence[world, first] > self.sequence[world, second]
+        i, j = np.where(swap, second, first), np.where(swap, first, second)
+        order = np.lexsort((self.sequence[world, j], self.sequence[world, i], world))
+        return world[order], i[order], j[order]
+
+    def _merge(self):
+        """Слияния касающихся пар во всех мирах"""
+        contacts = self._find_contacts()
+        if contacts is None or len(contacts[0]) == 0:
+            return
+
+        world, i, j = self._greedy_matching(*contacts)
+
+        # Слитый шарик занимает слот i, слот j освобождается. Номера новых
+        # шариков идут в порядке слияний внутри мира (world уже упорядочен)
+        within_world = np.arange(len(world)) - np.searchsorted(world, world)
+        self.sequence[world, i] = self._next_sequence[world] + within_world
+        merges = np.bincount(world, minlength=self.worlds)
+        self._next_sequence += merges
+        r1, r2 = self.radius[world, i], self.radius[world, j]
+        m1, m2 = r1 * 0.1, r2 * 0.1  # Масса как в Ball
+        total = m1 + m2
+        self.vx[world, i] = (self.vx[world, i] * m1 + self.vx[world, j] * m2) / total
+        self.vy[world, i] = (self.vy[world, i] * m1 + self.vy[world, j] * m2) / total
+        self.x[world, i] = (self.x[world, i] + self.x[world, j]) / 2
+        self.y[world, i] = (self.y[world, i] + self.y[world, j]) / 2
+        self.radius[world, i] = np.sqrt(r1 ** 2 + r2 ** 2) * self.merge_radius_factor[world]
+        self.colors[world, i] = (self.colors[world, i] + self.colors[world, j]) // 2
+        self.alive[world, j] = False
+        self.merge_count += merges
+
+    def _greedy_matching(self, world: np.ndarray, i: np.ndarray, j: np.ndarray):
+        """
+        Выбор сливающихся пар с тем же результатом, что последовательный
+        перебор в GameLogic: пара принимается, если ни один из ее шариков
+        не слился в более ранней паре. Векторизовано по раундам: пара,
+        самая ранняя среди оставшихся для обоих своих шариков, точно
+        принимается, после чего пары с занятыми шариками отбрасываются.
+        """
+        balls = self.alive.shape[1]
+        key_i = world * balls + i
+        key_j = world * balls + j
+        rank = np.arange(len(world))  # Пары уже упорядочены как в GameLogic
+        earliest = np.empty(self.alive.size, dtype=np.int64)
+        accepted = []
+        while len(rank):
+            earliest[key_i] = len(world)
+            earliest[key_j] = len(world)
+            np.minimum.at(earliest, key_i, rank)
+            np.minimum.at(earliest, key_j, rank)
+            take = (earliest[key_i] == rank) & (earliest[key_j] == rank)
+            accepted.append(rank[take])
+
+            taken = np.zeros(self.alive.size, dtype=bool)
+            taken[key_i[take]] = True
+            taken[key_j[take]] = True
+            keep = ~(taken[key_i] | taken[key_j])
+            rank, key_i, key_j = rank[keep], key_i[keep], key_j[keep]
+
+        accepted = np.sort(np.concatenate(accepted))  # Слияния в порядке контактов
+        return world[accepted], i[accepted], j[accepted]
+
+    def result(self) -> BatchResult:
+        """Итоговая статистика по мирам"""
+        return BatchResult(
+            final_count=self.alive.sum(axis=1),
+            white_count=(is_white(self.colors) & self.alive).sum(axis=1),
+            merge_count=self.merge_count.copy(),
+            deletion_count=self.deletion_count.copy(),
+            absorbed_count=self.absorbed_count.copy(),
+        )
+
+
+def run_batch(worlds: int, ticks: int, seed: int = None, balls: int = INITIAL_BALLS_COUNT,
+              width: int = SCREEN_WIDTH, height: int = SCREEN_HEIGHT, **params) -> BatchResult:
+    """Симуляция worlds миров на ticks тиков; params - параметры BatchSimulation"""
+    simulation = BatchSimulation(worlds, balls, width, height, seed, **params)
+    dt = 1.0 / FPS
+    for _ in range(ticks):
+        simulation.step(dt)
+    return simulation.result()
+
+
+def main():
+    """Точка входа: случайный перебор параметров по мирам"""
+    parser = argparse.ArgumentParser(description="Пакетный перебор параметров симуляции шариков")
+    parser.add_argument("--worlds", type=int, default=10000, help="количество миров (прогонов)")
+    parser.add_argument("--ticks", type=int, default=FPS * 10, help="тиков в каждом мире")
+    parser.add_argument("--seed", type=int, default=0, help="seed миров и перебора")
+    parser.add_argument("--balls", type=int, default=INITIAL_BALLS_COUNT, help="стартовое количество шариков")
+    parser.add_argument("--width", type=int, default=SCREEN_WIDTH, help="ширина мира")
+    parser.add_argument("--height", type=int, default=SCREEN_HEIGHT, help="высота мира")
+    parser.add_argument("--chunk", type=int, default=2048, help="миров в одном пакете (ограничивает память)")
+    parser.add_argument("--top", type=int, default=5, help="сколько лучших наборов параметров показать")
+    args = parser.parse_args()
+
+    # Диапазоны перебора
+    rng = np.random.default_rng(args.seed)
+    params = {
+        "friction": rng.uniform(0.95, 1.0, args.worlds),
+        "absorption_radius": rng.uniform(20, 200, args.worlds),
+        "merge_radius_factor": rng.uniform(0.6, 1.0, args.worlds),
+        "wall_restitution": rng.uniform(0.5, 1.0, args.worlds),
+    }
+
+    start = time.perf_counter()
+    results = []
+    for offset in range(0, args.worlds, args.chunk):
+        chunk = slice(offset, min(offset + args.chunk, args.worlds))
+        results.append(run_batch(chunk.stop - chunk.start, args.ticks, args.seed, args.balls,
+                                 args.width, args.height, first_world=offset,
+                                 **{name: values[chunk] for name, values in params.items()}))
+    elapsed = time.perf_counter() - start
+
+    result = BatchResult(*(np.concatenate([getattr(part, name) for part in results])
+                           for name in BatchResult.__dataclass_fields__))
+    print(f"Миров: {args.worlds}, тиков: {args.ticks}, время: {elapsed:.2f} с "
+          f"({args.worlds / elapsed:.0f} прогонов/с)")
+    print(f"Шариков в среднем: {result.final_count.mean():.2f}, "
+          f"слияний: {result.merge_count.mean():.2f}, "
+          f"доля белых: {result.white_fraction.mean():.3f}")
+
+    # Лучшие - больше всего шариков без белых
+    score = result.final_count * (1.0 - result.white_fraction)
+    print(f"{'Трение':>8} {'Всас.':>7} {'Слияние':>8} {'Стены':>7} {'Шариков':>8} {'Белых':>6} {'Слияний':>8}")
+    for world in np.argsort(-score, kind="stable")[:args.top]:
+        print(f"{params['friction'][world]:>8.3f} {params['absorption_radius'][world]:>7.1f} "
+              f"{params['merge_radius_factor'][world]:>8.3f} {params['wall_restitution'][world]:>7.3f} "
+              f"{result.final_count[world]:>8} {result.white_count[world]:>6} {result.merge_count[world]:>8}")
+
+
+if __name__ == "__main__":
+    main()
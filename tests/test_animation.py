@@ -0,0 +1,93 @@
+"""Планировщик анимаций и переключение состояний шариков"""
+
+import pytest
+
+from animation import ABSORPTION_DURATION, RELEASE_DURATION, AnimationScheduler
+from logic import Ball, BallState, Color, GameLogic, Vector2
+
+DT = 1.0 / 60.0
+
+
+def make_ball(x=0.0, y=0.0, ball_id=1):
+    return Ball(Vector2(x, y), 20, Color(255, 0, 0), Vector2(0, 0), ball_id)
+
+
+def run_until_events(scheduler, ticks):
+    events = []
+    for _ in range(ticks):
+        events.extend(scheduler.update(DT))
+    return events
+
+
+def test_animation_completes_once_at_target():
+    scheduler = AnimationScheduler()
+    ball = make_ball()
+    scheduler.start(ball, "move", Vector2(0, 0), Vector2(100, 50), 0.5)
+
+    assert run_until_events(scheduler, 29) == []
+    assert 0.0 < ball.absorption_progress < 1.0
+
+    events = run_until_events(scheduler, 2)
+    assert [(event.ball, event.kind) for event in events] == [(ball, "move")]
+    assert (ball.position.x, ball.position.y) == pytest.approx((100, 50))
+    assert ball.absorption_progress == 1.0
+    assert len(scheduler) == 0
+    assert run_until_events(scheduler, 10) == []
+
+
+def test_reverse_animation_progress_goes_to_zero():
+    scheduler = AnimationScheduler()
+    ball = make_ball()
+    scheduler.start(ball, "release", Vector2(0, 0), Vector2(10, 10), 0.25, reverse=True)
+
+    events = run_until_events(scheduler, 20)
+    assert len(events) == 1
+    assert ball.absorption_progress == 0.0
+
+
+def test_restart_replaces_animation_without_event():
+    scheduler = AnimationScheduler()
+    ball = make_ball()
+    scheduler.start(ball, "first", Vector2(0, 0), Vector2(100, 0), 0.5)
+    run_until_events(scheduler, 10)
+    scheduler.start(ball, "second", Vector2(0, 0), Vector2(0, 100), 0.5)
+
+    events = run_until_events(scheduler, 40)
+    assert [event.kind for event in events] == ["second"]
+    assert (ball.position.x, ball.position.y) == pytest.approx((0, 100))
+
+
+def test_many_animations_complete_in_duration_order():
+    scheduler = AnimationScheduler(capacity=2)
+    balls = [make_ball(ball_id=i) for i in range(100)]
+    for i, ball in enumerate(balls):
+        scheduler.start(ball, i, Vector2(0, 0), Vector2(i, i), 0.1 + i * 0.01)
+
+    finished = [event.kind for event in run_until_events(scheduler, 120)]
+    assert sorted(finished) == list(range(100))
+    assert finished == sorted(finished)
+    for i, ball in enumerate(balls):
+        assert (ball.position.x, ball.position.y) == pytest.approx((i, i))
+
+
+def test_absorb_and_release_switch_ball_states():
+    game = GameLogic(800, 600, seed=0)
+    ball = game.balls[0]
+    game.set_mouse_position(ball.position.x, ball.position.y)
+
+    assert game.try_absorb_ball()
+    assert ball.state == BallState.BEING_ABSORBED
+    for _ in range(int(ABSORPTION_DURATION / DT) + 2):
+        game.update(DT)
+    assert ball.state == BallState.IN_INVENTORY
+    slot = game.inventory._get_slot_position(0)
+    assert (ball.position.x, ball.position.y) == pytest.approx((slot.x, slot.y))
+
+    assert game.release_ball(Vector2(50, 0))
+    assert ball.state == BallState.BEING_RELEASED
+    target = ball.target_position
+    for _ in range(int(RELEASE_DURATION / DT) + 2):
+        game.update(DT)
+    assert ball.state == BallState.FREE
+    assert ball in game.balls
+    assert abs(ball.position.x - target.x) < 5 and abs(ball.position.y - target.y) < 5
@@ -0,0 +1,94 @@
+"""Поиск контактов и пакетный расчет отскоков"""
+
+import numpy as np
+import pytest
+
+from collision import find_contacts, solve_contacts
+
+
+def brute_force_contacts(x, y, radii):
+    """Все касающиеся пары перебором"""
+    pairs = [
+        (i, j)
+        for i in range(len(x))
+        for j in range(i + 1, len(x))
+        if (x[i] - x[j]) ** 2 + (y[i] - y[j]) ** 2 <= (radii[i] + radii[j]) ** 2
+    ]
+    return [i for i, _ in pairs], [j for _, j in pairs]
+
+
+def momentum(x, y, vx, vy, mass):
+    """Импульс и взвешенный центр масс"""
+    return np.array([(mass * values).sum() for values in (vx, vy, x, y)])
+
+
+def energy(vx, vy, mass):
+    return (mass * (vx * vx + vy * vy)).sum()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_find_contacts_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(0, 500, 300)
+    y = rng.uniform(-200, 300, 300)
+    radii = rng.uniform(2, 30, 300)
+
+    first, second = find_contacts(x, y, radii)
+    expected_first, expected_second = brute_force_contacts(x, y, radii)
+    assert first.tolist() == expected_first
+    assert second.tolist() == expected_second
+
+
+def test_chain_keeps_momentum():
+    # Покоящийся шарик, налетающий на него и третий за ним
+    x = np.array([0.0, 40.0, 80.0])
+    y = np.zeros(3)
+    vx = np.array([0.0, -100.0, 0.0])
+    vy = np.zeros(3)
+    radii = np.full(3, 20.0)
+    mass = radii * 0.1
+    before = momentum(x, y, vx, vy, mass)
+    energy_before = energy(vx, vy, mass)
+
+    first, second = find_contacts(x, y, radii)
+    solve_contacts(x, y, vx, vy, 1.0 / mass, radii, first, second, restitution=1.0)
+
+    assert momentum(x, y, vx, vy, mass) == pytest.approx(before)
+    assert energy(vx, vy, mass) <= energy_before
+    # Отбитый шарик не может лететь быстрее ударившего
+    assert abs(vx[0]) <= 100.0
+
+
+@pytest.mark.parametrize("restitution", [0.0, 0.8, 1.0])
+def test_random_cluster_keeps_momentum(restitution):
+    rng = np.random.default_rng(0)
+    x = rng.uniform(0, 300, 200)
+    y = rng.uniform(0, 300, 200)
+    vx = rng.uniform(-50, 50, 200)
+    vy = rng.uniform(-50, 50, 200)
+    radii = rng.uniform(10, 25, 200)
+    mass = radii * 0.1
+    before = momentum(x, y, vx, vy, mass)
+    energy_before = energy(vx, vy, mass)
+
+    first, second = find_contacts(x, y, radii)
+    assert len(first) > 0
+    solve_contacts(x, y, vx, vy, 1.0 / mass, radii, first, second, restitution=restitution)
+
+    assert momentum(x, y, vx, vy, mass) == pytest.approx(before, rel=1e-9, abs=1e-6)
+    assert energy(vx, vy, mass) <= energy_before * (1 + 1e-9)
+
+
+def test_separating_contacts_are_untouched():
+    x = np.array([0.0, 30.0])
+    y = np.zeros(2)
+    vx = np.array([-10.0, 10.0])
+    vy = np.zeros(2)
+    radii = np.full(2, 20.0)
+
+    first, second = find_contacts(x, y, radii)
+    solve_contacts(x, y, vx, vy, np.ones(2), radii, first, second)
+
+    assert vx.tolist() == [-10.0, 10.0]
+    # Перекрытие при этом убирается
+    assert x[1] - x[0] > 30.0
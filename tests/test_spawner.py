@@ -0,0 +1,83 @@
+"""Массовое создание шариков без перекрытий"""
+
+import numpy as np
+import pytest
+
+from collision import find_contacts
+from logic import GameLogic
+from spawner import jittered_grid_positions, poisson_disk_positions, random_radii
+
+PLACEMENTS = {"grid": jittered_grid_positions, "poisson": poisson_disk_positions}
+
+
+def assert_no_overlaps(positions, radii):
+    first, _ = find_contacts(positions[:, 0], positions[:, 1], radii)
+    assert len(first) == 0
+
+
+def assert_inside(positions, radii, bounds):
+    left, top, right, bottom = bounds
+    assert (positions[:, 0] - radii >= left).all()
+    assert (positions[:, 0] + radii <= right).all()
+    assert (positions[:, 1] - radii >= top).all()
+    assert (positions[:, 1] + radii <= bottom).all()
+
+
+@pytest.mark.parametrize("method", PLACEMENTS)
+@pytest.mark.parametrize("seed", range(3))
+def test_positions_do_not_overlap(method, seed):
+    rng = np.random.default_rng(seed)
+    radii = random_radii(rng, 500, (15, 35))
+    bounds = (0, 0, 2000, 1500)
+
+    positions = PLACEMENTS[method](rng, radii, bounds)
+    placed = radii[:len(positions)]
+
+    assert len(positions) > 0
+    assert_no_overlaps(positions, placed)
+    assert_inside(positions, placed, bounds)
+
+
+@pytest.mark.parametrize("method", PLACEMENTS)
+def test_positions_avoid_obstacles(method):
+    rng = np.random.default_rng(1)
+    radii = random_radii(rng, 300, (10, 20))
+    obstacles = [(500.0, 400.0, 150.0), (100.0, 100.0, 60.0)]
+
+    positions = PLACEMENTS[method](rng, radii, (0, 0, 1000, 800), obstacles)
+    placed = radii[:len(positions)]
+
+    for ox, oy, radius in obstacles:
+        distance = np.hypot(positions[:, 0] - ox, positions[:, 1] - oy)
+        assert (distance > placed + radius).all()
+
+
+@pytest.mark.parametrize("method", PLACEMENTS)
+def test_spawn_balls_avoids_existing_balls(method):
+    game = GameLogic(1500, 1000, seed=2)
+    game.spawn_balls(100, method=method)
+    game.spawn_balls(100, method=method)
+
+    data = np.array([(ball.position.x, ball.position.y, ball.radius) for ball in game.balls])
+    assert_no_overlaps(data[:, :2], data[:, 2])
+    assert len({ball.id for ball in game.balls}) == len(game.balls)
+    assert not any(game.deletion_zone.contains_ball(ball) for ball in game.balls)
+
+
+def test_spawn_balls_is_deterministic_by_seed():
+    def snapshot(seed):
+        game = GameLogic(1000, 700, seed=seed)
+        game.spawn_balls(50, method="poisson")
+        return [(ball.position.x, ball.position.y, ball.radius, ball.color.to_tuple())
+                for ball in game.balls]
+
+    assert snapshot(5) == snapshot(5)
+    assert snapshot(5) != snapshot(6)
+
+
+def test_add_random_ball_always_adds_a_ball():
+    game = GameLogic(1000, 700, seed=0)
+    for _ in range(200):
+        count = len(game.balls)
+        game.add_random_ball()
+        assert len(game.balls) == count + 1
@@ -0,0 +1,104 @@
+"""Пакетная симуляция миров против GameLogic"""
+
+import numpy as np
+import pytest
+
+from logic import Ball, Color, GameLogic, Vector2
+from sweep import BatchSimulation, is_white, run_batch
+
+DT = 1.0 / 60.0
+
+
+def game_from_world(simulation, world):
+    """GameLogic с теми же начальными шариками, что и мир пакета"""
+    game = GameLogic(simulation.width, simulation.height, seed=0)
+    game.balls.clear()
+    for slot in np.flatnonzero(simulation.alive[world]).tolist():
+        game.balls.append(Ball(
+            Vector2(simulation.x[world, slot], simulation.y[world, slot]),
+            simulation.radius[world, slot],
+            Color(*simulation.colors[world, slot].tolist()),
+            Vector2(simulation.vx[world, slot], simulation.vy[world, slot]),
+            slot,
+        ))
+    return game
+
+
+def world_state(simulation, world):
+    """Шарики мира в порядке списка GameLogic.balls"""
+    alive = np.flatnonzero(simulation.alive[world])
+    order = alive[np.argsort(simulation.sequence[world, alive])]
+    return [
+        (simulation.x[world, slot], simulation.y[world, slot], simulation.radius[world, slot],
+         tuple(simulation.colors[world, slot].tolist()))
+        for slot in order.tolist()
+    ]
+
+
+def game_state(game):
+    return [(ball.position.x, ball.position.y, ball.radius, ball.color.to_tuple())
+            for ball in game.balls]
+
+
+@pytest.mark.parametrize("width, height, balls", [(1000, 700, 8), (500, 400, 30)])
+def test_batch_matches_game_logic(width, height, balls):
+    simulation = BatchSimulation(12, balls, width, height, seed=7, absorb_interval=0)
+    games = [game_from_world(simulation, world) for world in range(simulation.worlds)]
+
+    for tick in range(600):
+        simulation.step(DT)
+        for game in games:
+            game.update(DT)
+        if tick % 60 == 59:
+            for world, game in enumerate(games):
+                assert world_state(simulation, world) == game_state(game)
+
+    assert simulation.merge_count.tolist() == [game.merge_count for game in games]
+    assert simulation.deletion_count.tolist() == [game.deletion_count for game in games]
+
+
+def test_greedy_matching_matches_sequential_loop():
+    simulation = BatchSimulation(50, 12, 300, 300, seed=0)
+    rng = np.random.default_rng(1)
+    first, second = np.triu_indices(12, 1)
+    for _ in range(50):
+        touching = rng.random((50, len(first))) < 0.3
+        world, pair = np.nonzero(touching)
+        got = simulation._greedy_matching(world, first[pair], second[pair])
+
+        expected = []
+        for w in range(50):
+            merged = set()
+            for p in np.flatnonzero(touching[w]).tolist():
+                i, j = int(first[p]), int(second[p])
+                if i not in merged and j not in merged:
+                    merged |= {i, j}
+                    expected.append((w, i, j))
+        assert list(zip(*(values.tolist() for values in got))) == expected
+
+
+def test_results_do_not_depend_on_chunking():
+    whole = run_batch(6, 120, seed=5)
+    tail = run_batch(3, 120, seed=5, first_world=3)
+    for name in ("final_count", "white_count", "merge_count", "deletion_count", "absorbed_count"):
+        assert getattr(whole, name)[3:].tolist() == getattr(tail, name).tolist()
+
+
+def test_per_world_parameters_apply_to_their_world():
+    params = {
+        "friction": [0.95, 1.0],
+        "absorption_radius": [200.0, 20.0],
+        "merge_radius_factor": [0.6, 1.0],
+        "wall_restitution": [1.0, 0.5],
+    }
+    batch = run_batch(2, 300, seed=3, balls=20, width=500, height=400, **params)
+    for world in range(2):
+        single = run_batch(1, 300, seed=3, balls=20, width=500, height=400, first_world=world,
+                           **{name: values[world] for name, values in params.items()})
+        for name in ("final_count", "white_count", "merge_count", "deletion_count", "absorbed_count"):
+            assert getattr(batch, name)[world] == getattr(single, name)[0]
+
+
+def test_is_white_matches_color():
+    colors = np.array([(240, 240, 240), (255, 239, 255), (0, 0, 0), (255, 255, 255)])
+    assert is_white(colors).tolist() == [Color(*color).is_white() for color in colors.tolist()]